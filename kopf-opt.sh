@@ -6,5 +6,22 @@ KOPF_OPTIONS="--log-format=json"
 # Restrict watch to operator namespace.
 KOPF_NAMESPACED=false
 
+# Restrict watches with namespace allow and deny lists.
+# WATCH_NAMESPACES and EXCLUDE_NAMESPACES are comma separated lists of names
+# or glob patterns. Namespaces outside of these lists are never watched.
+if [ -n "${WATCH_NAMESPACES}${EXCLUDE_NAMESPACES}" ]; then
+    # The operator namespace is always watched for the default config.
+    KOPF_NAMESPACED=true
+    # Patterns must not be expanded as file globs.
+    set -f
+    for KOPF_NAMESPACE_PATTERN in $(echo "${WATCH_NAMESPACES:-*}" | tr ',' ' '); do
+        KOPF_OPTIONS="${KOPF_OPTIONS} --namespace=${KOPF_NAMESPACE_PATTERN}"
+    done
+    for KOPF_NAMESPACE_PATTERN in $(echo "${EXCLUDE_NAMESPACES}" | tr ',' ' '); do
+        KOPF_OPTIONS="${KOPF_OPTIONS} --namespace=!${KOPF_NAMESPACE_PATTERN}"
+    done
+    set +f
+fi
+
 # Do not attempt to coordinate with other kopf operators.
 KOPF_STANDALONE=true
@@ -0,0 +1,93 @@
+from hashlib import sha256
+from time import time
+
+import os
+import re
+
+from infinite_relative_backoff import InfiniteRelativeBackoff
+
+class BitwardenCircuitBreaker:
+    """
+    Circuit breaker per Bitwarden access token.
+
+    Consecutive authorization or rate limit failures open the circuit, pausing all
+    syncs which use the token. Once the open period expires a single probe is
+    allowed; success closes the circuit and failure opens it for longer.
+    """
+    breakers = {}
+    # Open period grows from reset seconds up to maximum seconds
+    maximum = int(os.environ.get('CIRCUIT_BREAKER_MAXIMUM', 3600))
+    reset = int(os.environ.get('CIRCUIT_BREAKER_RESET', 60))
+    # Consecutive token failures which open the circuit
+    threshold = int(os.environ.get('CIRCUIT_BREAKER_THRESHOLD', 3))
+    token_failure_re = re.compile(
+        r'\b(401|403|429)\b|unauthorized|forbidden|too many requests|rate limit',
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def get(cls, access_token):
+        token_digest = sha256(access_token.encode('utf-8')).hexdigest()
+        breaker = cls.breakers.get(token_digest)
+        if not breaker:
+            breaker = cls.breakers[token_digest] = cls()
+        return breaker
+
+    @classmethod
+    def is_token_failure(cls, err):
+        return bool(cls.token_failure_re.search(str(err)))
+
+    def __init__(self):
+        self.failures = 0
+        self.open_delays = None
+        self.open_until = None
+        self.probe_in_flight = False
+
+    @property
+    def state(self):
+        if self.open_until is None:
+            return 'closed'
+        if self.probe_in_flight or time() >= self.open_until:
+            return 'half-open'
+        return 'open'
+
+    def allow_request(self):
+        """
+        Return whether a request with this token may be made now.
+        """
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'open' or self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def record_failure(self, err):
+        if self.probe_in_flight:
+            # Failed probe reopens circuit for a longer period.
+            self.probe_in_flight = False
+            self.open_until = time() + next(self.open_delays)
+            return
+        if not self.is_token_failure(err):
+            # Only consecutive token failures open the circuit
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= self.threshold and self.open_until is None:
+            self.open_delays = iter(InfiniteRelativeBackoff(
+                initial_delay=self.reset, maximum=self.maximum, jitter=0.1,
+            ))
+            self.open_until = time() + next(self.open_delays)
+
+    def release_probe(self):
+        """
+        Allow another probe if the probe in flight ended without recording a result.
+        """
+        self.probe_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.open_delays = None
+        self.open_until = None
+        self.probe_in_flight = False
@@ -0,0 +1,103 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import monotonic
+
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger('decode-pool')
+
+class BitwardenDecodePool:
+    """
+    Executor for decoding Bitwarden snapshots off the event loop, configured with
+    DECODE_POOL as "thread" (default), "process", or "inline".
+
+    YAML and JSON parsing is pure Python and holds the GIL, so in a thread it
+    still competes with the event loop and only lets it run between GIL switch
+    intervals. Only processes avoid GIL contention, at the cost of pickling results.
+    """
+    mode = os.environ.get('DECODE_POOL', 'thread')
+    # Listings with fewer secrets are decoded on the loop, which is faster than a hand-off
+    min_secrets = int(os.environ.get('DECODE_POOL_MIN_SECRETS', 200))
+    workers = int(os.environ.get('DECODE_POOL_WORKERS', 2))
+    # Seconds between ticks measuring event loop lag while work is offloaded
+    tick = 0.01
+
+    executor = None
+    samples = deque(maxlen=100)
+
+    @classmethod
+    def record(cls, name, count, duration, loop_blocked, offloaded):
+        cls.samples.append({
+            "count": count,
+            "duration": round(duration, 4),
+            "loopBlocked": round(loop_blocked, 4),
+            "name": name,
+            "offloaded": offloaded,
+        })
+
+    @classmethod
+    async def measure_lag(cls, future):
+        """
+        Return longest delay of a periodic tick beyond its interval until future is done.
+        """
+        lag = 0
+        while not future.done():
+            start = monotonic()
+            await asyncio.wait({future}, timeout=cls.tick)
+            lag = max(lag, monotonic() - start - cls.tick)
+        return lag
+
+    @classmethod
+    async def run(cls, func, *args, count=None):
+        """
+        Run func in the pool and return its result, or run it on the loop if the
+        pool is not started or fewer than min_secrets are decoded.
+        """
+        start = monotonic()
+        if cls.executor is None or (count is not None and count < cls.min_secrets):
+            result = func(*args)
+            duration = monotonic() - start
+            cls.record(func.__qualname__, count, duration, duration, offloaded=False)
+            return result
+        future = asyncio.get_running_loop().run_in_executor(cls.executor, func, *args)
+        # Time spent on the loop submitting work, then the longest loop lag while waiting
+        submitted = monotonic() - start
+        loop_blocked = max(submitted, await cls.measure_lag(future))
+        result = await future
+        duration = monotonic() - start
+        cls.record(func.__qualname__, count, duration, loop_blocked, offloaded=True)
+        return result
+
+    @classmethod
+    def stats(cls):
+        ret = {
+            "minSecrets": cls.min_secrets,
+            "mode": cls.mode,
+            "recent": list(cls.samples)[-10:],
+            "workers": cls.workers,
+        }
+        for offloaded, key in ((False, "inline"), (True, "offloaded")):
+            samples = [sample for sample in cls.samples if sample['offloaded'] == offloaded]
+            ret[key] = {
+                "count": len(samples),
+                "maxDuration": max((sample['duration'] for sample in samples), default=0),
+                "maxLoopBlocked": max((sample['loopBlocked'] for sample in samples), default=0),
+            }
+        return ret
+
+    @classmethod
+    async def on_startup(cls):
+        if cls.mode == 'process':
+            cls.executor = ProcessPoolExecutor(max_workers=cls.workers)
+        elif cls.mode == 'thread':
+            cls.executor = ThreadPoolExecutor(max_workers=cls.workers, thread_name_prefix='decode')
+        elif cls.mode != 'inline':
+            logger.warning(f"Unknown DECODE_POOL {cls.mode}, decoding on the event loop")
+
+    @classmethod
+    async def on_cleanup(cls):
+        if cls.executor:
+            cls.executor.shutdown(wait=False, cancel_futures=True)
+            cls.executor = None
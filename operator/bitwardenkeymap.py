@@ -0,0 +1,87 @@
+from math import ceil
+from time import time
+
+import os
+
+class BitwardenKeyMap:
+    """
+    Bitwarden secret ids by project and key learned from a full secret listing,
+    with timings used to choose between full listing and fetching by id.
+    """
+    # Fetch by id only for up to this many secrets
+    max_ids = int(os.environ.get('SELECTIVE_FETCH_MAX_IDS', 20))
+    # Relearn from a full listing after this many seconds
+    max_age = int(os.environ.get('SELECTIVE_FETCH_MAX_AGE', 3600))
+    # Concurrent `bws secret get` calls
+    concurrency = int(os.environ.get('SELECTIVE_FETCH_CONCURRENCY', 4))
+    # Without timings, fetch by id only when the org is this many times larger
+    size_ratio = int(os.environ.get('SELECTIVE_FETCH_SIZE_RATIO', 10))
+
+    def __init__(self, definitions, list_duration, get_duration=None):
+        self.count = len(definitions)
+        self.get_duration = get_duration
+        self.learned = time()
+        self.list_duration = list_duration
+        self.secret_ids = {}
+        for definition in definitions:
+            self.secret_ids.setdefault(
+                (definition['projectId'], definition['key']), []
+            ).append(definition['id'])
+
+    @property
+    def expired(self):
+        return time() >= self.learned + self.max_age
+
+    def get_secret_ids(self, refs, projects):
+        """
+        Return secret ids in listing order for references or None if any reference is unknown.
+        """
+        ids = set()
+        for project_name, key in refs:
+            if project_name:
+                project = projects.get_project(project_name)
+                if not project:
+                    return None
+                ref_ids = self.secret_ids.get((project.id, key))
+            else:
+                ref_ids = [
+                    secret_id
+                    for (_, secret_key), secret_ids in self.secret_ids.items() if secret_key == key
+                    for secret_id in secret_ids
+                ]
+            if not ref_ids:
+                return None
+            ids.update(ref_ids)
+        return [
+            secret_id
+            for secret_ids in self.secret_ids.values()
+            for secret_id in secret_ids if secret_id in ids
+        ]
+
+    def matches(self, definitions):
+        """
+        Return whether secrets fetched by id still have the learned project and key.
+        """
+        return all(
+            definition['id'] in self.secret_ids.get((definition['projectId'], definition['key']), ())
+            for definition in definitions
+        )
+
+    def observe_get(self, duration):
+        """
+        Record duration of one `bws secret get` call as a moving average.
+        """
+        if self.get_duration is None:
+            self.get_duration = duration
+        else:
+            self.get_duration = 0.8 * self.get_duration + 0.2 * duration
+
+    def prefer_selective(self, id_count):
+        """
+        Return whether fetching id_count secrets by id is expected to be cheaper than a full list.
+        """
+        if self.expired or id_count > self.max_ids:
+            return False
+        if self.get_duration is None:
+            return id_count * self.size_ratio <= self.count
+        return ceil(id_count / self.concurrency) * self.get_duration < self.list_duration
@@ -24,6 +24,12 @@ class BitwardenProjects:
         self.projects_dict = {
             project['name']: BitwardenProject(project) for project in projects
         }
+        self.projects_by_id = {
+            project.id: project for project in self.projects_dict.values()
+        }
 
     def get_project(self, project_name):
         return self.projects_dict.get(project_name)
+
+    def get_project_by_id(self, project_id):
+        return self.projects_by_id.get(project_id)
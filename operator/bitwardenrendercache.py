@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+class BitwardenRenderCache:
+    """
+    Bounded LRU cache of rendered Bitwarden secret values.
+
+    Keys identify the secret revision and how it was rendered, so entries never
+    need invalidation; stale revisions simply age out.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.maxsize = maxsize
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def size(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            "hitRate": self.hit_rate,
+            "hits": self.hits,
+            "maxsize": self.maxsize,
+            "misses": self.misses,
+            "size": self.size,
+        }
@@ -9,6 +9,7 @@ class BitwardenSecret:
         self.id = definition['id']
         self.key = definition['key']
         self.project_id = definition['projectId']
+        self.revision_date = definition.get('revisionDate')
 
         # Attempt to handle values as YAML, but only use YAML parsed value if it is not a string.
         try:
@@ -1,46 +1,222 @@
 from base64 import b64encode
+from hashlib import sha256
+from time import time
 
 import asyncio
 import json
 import os
+import re
 
+from bitwardendecodepool import BitwardenDecodePool
+from bitwardenkeymap import BitwardenKeyMap
+from bitwardenrendercache import BitwardenRenderCache
 from bitwardensecret import BitwardenSecret
 from bitwardensyncerror import BitwardenSyncError
 
 class BitwardenSecrets:
     bws_cmd = os.environ.get('BWS_CMD', 'bws')
+    key_maps = {}
+    render_cache = BitwardenRenderCache(maxsize=int(os.environ.get('RENDER_CACHE_SIZE', 4096)))
+    not_found_re = re.compile(r'\b404\b|not found|does not exist', re.IGNORECASE)
 
     @classmethod
-    async def get(cls, access_token, project_id=None):
-        cmd = [cls.bws_cmd, '--access-token', access_token, '--output', 'json', 'secret', 'list']
-        if project_id:
-            cmd.append(project_id)
-
+    async def bws(cls, access_token, *args):
         proc = await asyncio.create_subprocess_exec(
-            *cmd,
+            cls.bws_cmd, '--access-token', access_token, '--output', 'json', 'secret', *args,
             stderr=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await proc.communicate()
+        try:
+            stdout, stderr = await proc.communicate()
+        finally:
+            # Do not leave bws running when cancelled
+            if proc.returncode is None:
+                proc.kill()
         if stderr:
             raise BitwardenSyncError(f"bws error: {stderr}")
-        return cls(json.loads(stdout))
+        return json.loads(stdout)
+
+    @classmethod
+    async def get(cls, access_token, project_id=None, projects=None, refs=None):
+        """
+        Get secrets visible to access token, optionally restricted to a project.
+
+        When the references needed by the caller are known, secrets may be fetched
+        individually by id if that is expected to be cheaper than a full listing.
+        """
+        key_map_key = (sha256(access_token.encode('utf-8')).hexdigest(), project_id)
+        key_map = cls.key_maps.get(key_map_key)
+        if key_map and projects is not None and refs is not None:
+            secret_ids = key_map.get_secret_ids(refs=refs, projects=projects)
+            if secret_ids is not None and key_map.prefer_selective(len(secret_ids)):
+                try:
+                    definitions = await cls.get_by_ids(access_token, secret_ids, key_map)
+                    if key_map.matches(definitions):
+                        bitwarden_secrets = await cls.decode(definitions)
+                        bitwarden_secrets.definitions = definitions
+                        bitwarden_secrets.refs = frozenset(refs)
+                        return bitwarden_secrets
+                except BitwardenSyncError as err:
+                    # Authorization, rate limit, and other failures would fail the listing too
+                    if not cls.not_found_re.search(str(err)):
+                        raise
+                # Secrets may have been deleted, renamed, or moved, fall back to full listing.
+
+        cmd = ['list']
+        if project_id:
+            cmd.append(project_id)
+        start = time()
+        definitions = await cls.bws(access_token, *cmd)
+        cls.key_maps[key_map_key] = BitwardenKeyMap(
+            definitions,
+            get_duration=key_map.get_duration if key_map else None,
+            list_duration=time() - start,
+        )
+        bitwarden_secrets = await cls.decode(definitions)
+        bitwarden_secrets.definitions = definitions
+        return bitwarden_secrets
+
+    @classmethod
+    async def decode(cls, definitions):
+        """
+        Parse secret definitions, off the event loop for large listings.
+        """
+        return await BitwardenDecodePool.run(cls, definitions, count=len(definitions))
+
+    @classmethod
+    async def get_by_ids(cls, access_token, secret_ids, key_map):
+        semaphore = asyncio.Semaphore(key_map.concurrency)
+
+        async def get_secret(secret_id):
+            async with semaphore:
+                start = time()
+                definition = await cls.bws(access_token, 'get', secret_id)
+                key_map.observe_get(time() - start)
+                return definition
+
+        tasks = [asyncio.create_task(get_secret(secret_id)) for secret_id in secret_ids]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop remaining gets on the first failure
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
     def __init__(self, secrets):
+        # Definitions as fetched, which may be persisted in the snapshot cache
+        self.definitions = None
+        # References fetched by id, None if all secrets were listed
+        self.refs = None
         self.secrets = [BitwardenSecret(item) for item in secrets]
-
-    def __get_value(self, secret_key, project):
+        # Index secrets by key, preserving listing order, to avoid scanning all secrets per value.
+        self.secrets_by_id = {}
+        self.secrets_by_key = {}
         for secret in self.secrets:
+            self.secrets_by_id[secret.id] = secret
+            self.secrets_by_key.setdefault(secret.key, []).append(secret)
+
+    def covers(self, refs):
+        """
+        Return whether these secrets were fetched for all of the references.
+        """
+        return self.refs is None or refs <= self.refs
+
+    def changed_refs(self, other, projects):
+        """
+        Return (project name, key) references for secrets added, removed, or revised
+        between other snapshot and this one.
+        """
+        revisions = {
+            (secret.project_id, secret.key, secret.id): (secret.revision_date, secret.value)
+            for secret in self.secrets
+        }
+        other_revisions = {
+            (secret.project_id, secret.key, secret.id): (secret.revision_date, secret.value)
+            for secret in other.secrets
+        }
+        refs = set()
+        for ident in revisions.keys() | other_revisions.keys():
+            if revisions.get(ident) != other_revisions.get(ident):
+                project_id, key, _ = ident
+                project = projects.get_project_by_id(project_id)
+                refs.add((project.name if project else None, key))
+        return refs
+
+    def __get_secret(self, secret_key, project):
+        for secret in self.secrets_by_key.get(secret_key, ()):
             if project and secret.project_id != project.id:
                 continue
-            if secret.key == secret_key:
-                return secret.value
+            return secret
         if project:
             raise BitwardenSyncError(
                 f"Bitwarden secret \"{secret_key}\" not found in project {project}"
             )
         raise BitwardenSyncError(f"Bitwarden secret \"{secret_key}\" not found")
 
+    @staticmethod
+    def __render_value(secret, src, base64encode):
+        value = secret.value
+        if src.key:
+            if not isinstance(value, dict):
+                raise BitwardenSyncError(
+                    f"Bitwarden secret {src.secret} not in YAML dictionary format for {src.key}"
+                )
+            # Check for key like `tls.key` at top level and use it if set.
+            if src.key in value:
+                value = value[src.key]
+            # Otherwise treat as deep key with `.` delimiters
+            else:
+                for item in src.key_path:
+                    if not isinstance(value, dict):
+                        raise BitwardenSyncError(
+                            f"Bitwarden secret {src.secret} not in YAML dictionary format for {src.key}"
+                        )
+                    if item not in value:
+                        raise BitwardenSyncError(
+                            f"Bitwarden secret {src.secret} has no key {src.key}"
+                        )
+                    value = value[item]
+        if not isinstance(value, str):
+            # Maybe not what is intended, but better than to fail?
+            value = json.dumps(value)
+        return b64encode(value.encode('utf-8')).decode('utf-8') if base64encode else value
+
+    def __render_template(self, src, projects, base64encode):
+        # Rendered templates only change with the revisions of the secrets they use.
+        revisions = []
+        for name, var in sorted(src.template_vars.items()):
+            if not var.secret:
+                revisions.append((name, var.value))
+                continue
+            project = projects.get_project(var.project) if var.project else None
+            secret = None if var.project and not project else self.__get_secret(var.secret, project)
+            if not secret or not secret.revision_date:
+                revisions = None
+                break
+            revisions.append((name, secret.id, secret.revision_date, var.key))
+        cache_key = None
+        if revisions is not None:
+            cache_key = ('template', src.template, tuple(revisions), base64encode)
+            value = self.render_cache.get(cache_key)
+            if value is not None:
+                return value
+
+        try:
+            value = src.compiled_template.substitute(
+                self.get_values(sources=src.template_vars, projects=projects)
+            )
+        except KeyError as err:
+            raise BitwardenSyncError(f"Template variable {err} not defined in vars") from err
+        except ValueError as err:
+            raise BitwardenSyncError(f"Invalid template: {err}") from err
+        if base64encode:
+            value = b64encode(value.encode('utf-8')).decode('utf-8')
+        if cache_key:
+            self.render_cache.put(cache_key, value)
+        return value
+
     def get_values(self, sources, projects, for_data=False):
         ret = {}
         for key, src in sources.items():
@@ -54,33 +230,21 @@ class BitwardenSecrets:
                     )
 
             if src.value:
-                ret[key] = b64encode(src.value.encode('utf-8')).decode('utf-8') if base64encode else src.value
+                ret[key] = src.encoded_value if base64encode else src.value
+            elif src.compiled_template is not None:
+                ret[key] = self.__render_template(src, projects, base64encode)
             elif src.secret:
-                value = self.__get_value(src.secret, project)
-                if src.key:
-                    if not isinstance(value, dict):
-                        raise BitwardenSyncError(
-                            f"Bitwarden secret {src.secret} not in YAML dictionary format for {src.key}"
-                        )
-                    # Check for key like `tls.key` at top level and use it if set.
-                    if src.key in value:
-                        value = value[src.key]
-                    # Otherwise treat as deep key with `.` delimiters
-                    else:
-                        for item in src.key.split('.'):
-                            if not isinstance(value, dict):
-                                raise BitwardenSyncError(
-                                    f"Bitwarden secret {src.secret} not in YAML dictionary format for {src.key}"
-                                )
-                            if item not in value:
-                                raise BitwardenSyncError(
-                                    f"Bitwarden secret {src.secret} has no key {src.key}"
-                                )
-                            value = value[item]
-                if not isinstance(value, str):
-                    # Maybe not what is intended, but better than to fail?
-                    value = json.dumps(value)
-                ret[key] = b64encode(value.encode('utf-8')).decode('utf-8') if base64encode else value
+                secret = self.__get_secret(src.secret, project)
+                # Rendered values only change with the secret revision.
+                if secret.revision_date:
+                    cache_key = (secret.id, secret.revision_date, src.key, base64encode)
+                    value = self.render_cache.get(cache_key)
+                    if value is None:
+                        value = self.__render_value(secret, src, base64encode)
+                        self.render_cache.put(cache_key, value)
+                else:
+                    value = self.__render_value(secret, src, base64encode)
+                ret[key] = value
             else:
                 raise BitwardenSyncError("No secret or value in configuration")
         return ret
@@ -0,0 +1,220 @@
+"""
+Persistent cache of Bitwarden listings for warm restarts and Bitwarden outages.
+"""
+
+from datetime import datetime, timezone
+from time import time
+
+import asyncio
+import logging
+import os
+
+import kubernetes_asyncio
+
+from bitwardendecodepool import BitwardenDecodePool
+from bitwardensnapshotcodec import BitwardenSnapshotCodec
+from k8sutil import K8sUtil
+
+logger = logging.getLogger('snapshot-cache')
+
+class BitwardenSnapshotCache:
+    """
+    Last full Bitwarden project and secret listings by access token digest,
+    persisted to Secrets in the operator namespace, enabled with SNAPSHOT_CACHE=true.
+
+    Changed listings are written in the background. Each Secret holds gzip
+    compressed JSON for one access token with fetch times and latest revision
+    dates of the listings. Secrets fetched individually between full listings
+    are merged into the listings so that persisted values are never older than
+    those applied.
+    """
+    enabled = os.environ.get('SNAPSHOT_CACHE', 'false') == 'true'
+    # Seconds between background writes of changed listings
+    interval = int(os.environ.get('SNAPSHOT_CACHE_INTERVAL', 60))
+    # Persisted listings older than this are not loaded
+    max_age = int(os.environ.get('SNAPSHOT_CACHE_MAX_AGE', 604800))
+    # Secrets have a maximum size of 1MiB
+    max_bytes = 1000000
+
+    label = f"{K8sUtil.operator_domain}/snapshot-cache"
+    token_digest_annotation = f"{K8sUtil.operator_domain}/token-digest"
+
+    dirty = set()
+    # Listings by token digest, each {"projects": listing, "secrets": {project id or "": listing}}
+    snapshots = {}
+    task = None
+
+    @staticmethod
+    def secret_name(token_digest):
+        return f"bitwarden-snapshot-{token_digest[:16]}"
+
+    @classmethod
+    def is_active(cls):
+        return cls.enabled and K8sUtil.operator_namespace is not None
+
+    @classmethod
+    def get(cls, token_digest, project_name=None):
+        """
+        Return project and secret definitions for the access token, optionally
+        restricted to a project, or None if not cached.
+        """
+        snapshot = cls.snapshots.get(token_digest)
+        if not snapshot or not snapshot.get('projects'):
+            return None
+        project_definitions = snapshot['projects']['definitions']
+        project_id = ''
+        if project_name:
+            project_id = next((
+                project['id'] for project in project_definitions if project['name'] == project_name
+            ), None)
+            if project_id is None:
+                return None
+        listing = snapshot['secrets'].get(project_id)
+        if not listing:
+            return None
+        return project_definitions, listing['definitions']
+
+    @classmethod
+    def put_projects(cls, token_digest, definitions):
+        if not cls.is_active():
+            return
+        snapshot = cls.snapshots.setdefault(token_digest, {"projects": None, "secrets": {}})
+        if snapshot['projects'] and snapshot['projects']['definitions'] == definitions:
+            return
+        snapshot['projects'] = {"definitions": definitions, "fetchedAt": time()}
+        cls.dirty.add(token_digest)
+
+    @classmethod
+    def put_secrets(cls, token_digest, project_id, definitions):
+        if not cls.is_active():
+            return
+        snapshot = cls.snapshots.setdefault(token_digest, {"projects": None, "secrets": {}})
+        listing = snapshot['secrets'].get(project_id or '')
+        if listing and listing['definitions'] == definitions:
+            return
+        snapshot['secrets'][project_id or ''] = BitwardenSnapshotCodec.make_listing(definitions, time())
+        cls.dirty.add(token_digest)
+
+    @classmethod
+    def merge_secrets(cls, token_digest, definitions):
+        """
+        Merge secrets fetched individually into persisted listings.
+        """
+        if not cls.is_active():
+            return
+        snapshot = cls.snapshots.get(token_digest)
+        if not snapshot:
+            return
+        for project_id, listing in list(snapshot['secrets'].items()):
+            merged = BitwardenSnapshotCodec.merge(listing, definitions)
+            if merged:
+                snapshot['secrets'][project_id] = merged
+                cls.dirty.add(token_digest)
+
+    @classmethod
+    async def on_startup(cls):
+        """
+        Load persisted listings and start background writes.
+        """
+        if not cls.is_active():
+            return
+        try:
+            secret_list = await K8sUtil.core_v1_api.list_namespaced_secret(
+                namespace=K8sUtil.operator_namespace,
+                label_selector=cls.label,
+            )
+        except kubernetes_asyncio.client.rest.ApiException as err:
+            logger.warning(f"Unable to load Bitwarden snapshot cache: {err}")
+            secret_list = None
+        for secret in secret_list.items if secret_list else ():
+            token_digest = (secret.metadata.annotations or {}).get(cls.token_digest_annotation)
+            if not token_digest:
+                logger.warning(
+                    f"Ignoring Bitwarden snapshot cache {secret.metadata.name} without {cls.token_digest_annotation}"
+                )
+                continue
+            try:
+                snapshot = BitwardenSnapshotCodec.expire(
+                    await BitwardenDecodePool.run(BitwardenSnapshotCodec.decode, secret.data['snapshot']),
+                    max_age=cls.max_age,
+                    now=time(),
+                )
+            # pylint: disable-next=broad-except
+            except Exception as err:
+                logger.warning(f"Ignoring invalid Bitwarden snapshot cache {secret.metadata.name}: {err}")
+                continue
+            if snapshot:
+                cls.snapshots[token_digest] = snapshot
+        logger.info(f"Loaded Bitwarden snapshot cache for {len(cls.snapshots)} access tokens")
+        cls.task = asyncio.create_task(cls.write_loop())
+
+    @classmethod
+    async def on_cleanup(cls):
+        """
+        Stop background writes and write any remaining changes.
+        """
+        if not cls.task:
+            return
+        cls.task.cancel()
+        await asyncio.gather(cls.task, return_exceptions=True)
+        cls.task = None
+        await cls.write_dirty()
+
+    @classmethod
+    async def write_loop(cls):
+        while True:
+            await asyncio.sleep(cls.interval)
+            await cls.write_dirty()
+
+    @classmethod
+    async def write_dirty(cls):
+        for token_digest in list(cls.dirty):
+            cls.dirty.discard(token_digest)
+            try:
+                await cls.write(token_digest)
+            # pylint: disable-next=broad-except
+            except Exception as err:
+                logger.warning(f"Failed to write Bitwarden snapshot cache: {err!r}")
+                cls.dirty.add(token_digest)
+
+    @classmethod
+    async def write(cls, token_digest):
+        snapshot = cls.snapshots[token_digest]
+        # Listings are replaced rather than modified, so a shallow copy may be encoded in the pool
+        encoded = await BitwardenDecodePool.run(BitwardenSnapshotCodec.encode, {
+            "projects": snapshot['projects'],
+            "secrets": dict(snapshot['secrets']),
+        })
+        if len(encoded) > cls.max_bytes:
+            logger.warning(
+                f"Bitwarden snapshot of {len(encoded)} bytes is too large for the snapshot cache"
+            )
+            return
+        revision_dates = [
+            listing['revisionDate'] for listing in snapshot['secrets'].values() if listing['revisionDate']
+        ]
+        body = kubernetes_asyncio.client.V1Secret(
+            metadata=kubernetes_asyncio.client.V1ObjectMeta(
+                annotations={
+                    cls.token_digest_annotation: token_digest,
+                    f"{K8sUtil.operator_domain}/fetched-at": datetime.now(timezone.utc).strftime('%FT%TZ'),
+                    f"{K8sUtil.operator_domain}/revision-date": max(revision_dates, default=''),
+                },
+                labels={cls.label: 'true'},
+                name=cls.secret_name(token_digest),
+            ),
+            data={"snapshot": encoded},
+        )
+        try:
+            await K8sUtil.core_v1_api.replace_namespaced_secret(
+                body=body,
+                name=cls.secret_name(token_digest),
+                namespace=K8sUtil.operator_namespace,
+            )
+        except kubernetes_asyncio.client.rest.ApiException as err:
+            if err.status != 404:
+                raise
+            await K8sUtil.core_v1_api.create_namespaced_secret(
+                body=body,
+                namespace=K8sUtil.operator_namespace,
+            )
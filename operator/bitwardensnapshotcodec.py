@@ -0,0 +1,72 @@
+from base64 import b64decode, b64encode
+
+import gzip
+import json
+
+class BitwardenSnapshotCodec:
+    """
+    Encoding, expiry, and merging of persisted Bitwarden listings.
+
+    A snapshot is {"projects": listing, "secrets": {project id or "": listing}}
+    where each listing has definitions, fetchedAt, and for secrets revisionDate.
+    Listings are replaced rather than modified so they may be encoded concurrently.
+    """
+
+    @staticmethod
+    def decode(data):
+        return json.loads(gzip.decompress(b64decode(data)))
+
+    @staticmethod
+    def encode(snapshot):
+        return b64encode(gzip.compress(
+            json.dumps(snapshot, separators=(',', ':')).encode('utf-8')
+        )).decode('ascii')
+
+    @staticmethod
+    def expire(snapshot, max_age, now):
+        """
+        Return snapshot without listings fetched more than max_age seconds ago,
+        or None if the project listing expired.
+        """
+        projects = snapshot.get('projects')
+        if not projects or now - projects['fetchedAt'] > max_age:
+            return None
+        return {
+            "projects": projects,
+            "secrets": {
+                project_id: listing for project_id, listing in snapshot.get('secrets', {}).items()
+                if now - listing['fetchedAt'] <= max_age
+            },
+        }
+
+    @staticmethod
+    def make_listing(definitions, fetched_at):
+        return {
+            "definitions": definitions,
+            "fetchedAt": fetched_at,
+            "revisionDate": max(
+                (definition.get('revisionDate') or '' for definition in definitions), default=None,
+            ),
+        }
+
+    @classmethod
+    def merge(cls, listing, definitions):
+        """
+        Return listing updated with individually fetched definitions which have a
+        newer revision, or None if none are newer.
+
+        Secrets not in the listing are left for the next full listing, as a
+        selective fetch does not show which project listings should include them.
+        """
+        updates = {definition['id']: definition for definition in definitions}
+        changed = False
+        merged = []
+        for definition in listing['definitions']:
+            update = updates.get(definition['id'])
+            if update and (update.get('revisionDate') or '') > (definition.get('revisionDate') or ''):
+                definition = update
+                changed = True
+            merged.append(definition)
+        if not changed:
+            return None
+        return cls.make_listing(merged, listing['fetchedAt'])
@@ -1,14 +1,31 @@
 from base64 import b64decode
+from datetime import datetime, timezone
+from hashlib import sha256
+from time import time
+
+import asyncio
+import os
+import random
 
 import kubernetes_asyncio
 
 from k8sutil import CachedK8sObject, K8sUtil
+from bitwardencircuitbreaker import BitwardenCircuitBreaker
 from bitwardensyncconfigsecret import BitwardenSyncConfigSecret
 from bitwardenprojects import BitwardenProjects
 from bitwardensecrets import BitwardenSecrets
+from bitwardensnapshotcache import BitwardenSnapshotCache
 from bitwardensyncerror import BitwardenSyncError
+from bitwardensyncindex import BitwardenSyncIndex, BitwardenSyncTarget
+from bitwardensyncinterval import BitwardenSyncInterval
 from bitwardensyncsecret import BitwardenSyncSecret
-from bitwardensyncutil import check_delete_secret, manage_secret
+from bitwardensyncstatus import BitwardenSyncStatus
+from bitwardensyncutil import apply_secret, check_delete_secret, manage_secret, render_secret
+from bitwardenwebhook import BitwardenWebhook
+from infinite_relative_backoff import InfiniteRelativeBackoff
+from k8snamespaces import K8sNamespaces
+from syncadmissionqueue import SyncAdmissionQueue
+from syncprofiler import SyncProfiler
 
 class BitwardenSyncConfig(CachedK8sObject):
     api_group = K8sUtil.operator_domain
@@ -18,7 +35,19 @@ class BitwardenSyncConfig(CachedK8sObject):
 
     api_group_version = f"{api_group}/{api_version}"
     cache = {}
-
+    # Failure backoff grows from syncInterval up to maximum seconds, varied by jitter fraction
+    backoff_jitter = float(os.environ.get('SYNC_BACKOFF_JITTER', 0.2))
+    backoff_maximum = int(os.environ.get('SYNC_BACKOFF_MAXIMUM', 3600))
+    # Seconds across which resumed syncs of healthy configs are spread, 0 for syncInterval
+    resume_sync_spread = int(os.environ.get('RESUME_SYNC_SPREAD', 0))
+    # Maximum seconds between syncs which verify every target regardless of changes
+    full_sync_interval = int(os.environ.get('FULL_SYNC_INTERVAL', 3600))
+    # Concurrent writes when one Secret is replicated to namespaces matching a selector
+    fan_out_concurrency = int(os.environ.get('FAN_OUT_CONCURRENCY', 10))
+    # Tasks syncing Secrets to namespaces which newly match a namespaceSelector
+    namespace_tasks = set()
+    # Maximum age in seconds of snapshot used to sync a created or updated BitwardenSyncSecret
+    targeted_sync_max_age = int(os.environ.get('TARGETED_SYNC_MAX_AGE', 300))
 
     @classmethod
     async def on_create(cls, logger, **kwargs):
@@ -28,57 +57,219 @@ class BitwardenSyncConfig(CachedK8sObject):
     @classmethod
     async def on_delete(cls, logger, **kwargs):
         config = cls(**kwargs)
+        SyncAdmissionQueue.cancel((config.kind, config.namespace, config.name))
         await config.delete_secrets(logger=logger)
+        BitwardenSyncIndex.remove(config)
         config.unregister()
 
     @classmethod
     async def on_resume(cls, logger, **kwargs):
         config = cls.register(**kwargs)
-        await config.sync_secrets(logger=logger)
+        await config.load_resume_snapshot(logger=logger)
+        config.queue_resume_sync(logger=logger)
 
     @classmethod
     async def on_update(cls, logger, **kwargs):
         config = cls.register(**kwargs)
-        await config.sync_secrets(logger=logger)
+        if config.sync_request != config.handled_sync_request:
+            # Sync requested by annotation, sync every target with fresh data
+            config.handled_sync_request = config.sync_request
+            config.sync_pending = True
+            await config.sync_secrets(force=True, logger=logger)
+        else:
+            await config.sync_secrets(logger=logger)
+
+    @classmethod
+    def on_namespace_event(cls, event_type, name, labels, logger):
+        """
+        Sync Secrets to a namespace which was created or relabeled to match a
+        namespaceSelector and mark Secrets in a deleted namespace pending.
+        """
+        if event_type == 'DELETED':
+            for config in cls.cache.values():
+                cls.create_namespace_task(config.on_namespace_deleted(namespace=name))
+            return
+        # Initial listing is covered by syncs on resume.
+        if event_type not in ('ADDED', 'MODIFIED'):
+            return
+        for config in cls.cache.values():
+            if not any(
+                config.is_namespace_pending(secret_config, name, labels)
+                for secret_config in config.secrets
+            ):
+                continue
+            cls.create_namespace_task(config.sync_namespace(namespace=name, logger=logger))
+
+    @classmethod
+    def create_namespace_task(cls, coro):
+        task = asyncio.create_task(coro)
+        cls.namespace_tasks.add(task)
+        task.add_done_callback(cls.namespace_tasks.discard)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # Current interval when adaptive sync interval is configured
+        self.adaptive_sync_interval = None
+        self.backoff_delays = None
+        self.backoff_token_digest = None
+        self.bitwarden_projects = None
+        self.bitwarden_secrets = None
+        self.handled_sync_request = self.sync_request
+        self.last_full_sync = 0
+        self.last_sync = time()
+        self.last_sync_generation = None
+        self.retry_after = 0
+        # Time when Bitwarden snapshot was fetched
+        self.snapshot_time = 0
+        # Whether targets were verified from the persisted snapshot while Bitwarden was unavailable
+        self.snapshot_verified = False
+        self.sync_error = None
+        self.sync_failures = 0
         self.sync_pending = False
+        # Status entries of the last sync by target namespace and name
+        self.sync_status_entries = None
 
     @property
     def access_token_secret_name(self):
         return self.spec.get("accessTokenSecret", {}).get("name")
 
+    @property
+    def bitwarden_refs(self):
+        """
+        Bitwarden secret references used by this config and its BitwardenSyncSecrets.
+        """
+        refs = set()
+        for secret_config in self.secrets:
+            refs.update(BitwardenSyncIndex.secret_config_refs(secret_config, project=self.project))
+        for secret in BitwardenSyncSecret.for_config(self):
+            refs.update(BitwardenSyncIndex.secret_config_refs(secret.secret_config))
+        return refs
+
+    @property
+    def poll_interval(self):
+        """
+        Interval between scheduled syncs, slowed when change notifications are received.
+        """
+        if BitwardenWebhook.enabled():
+            return max(self.sync_interval, BitwardenWebhook.poll_interval)
+        return self.sync_interval
+
     @property
     def project(self):
         return self.spec.get("project", None)
 
+    @property
+    def resume_priority(self):
+        """
+        Queue priority on resume, configs with failed or missing status first.
+        """
+        status = self.status or {}
+        if status.get('backoff') or status.get('failedSecrets') or any(
+            entry.get('state') != 'synced' for entry in status.get('secrets') or []
+        ):
+            return 0
+        if not status.get('secrets') and not status.get('summary'):
+            return 1
+        return 2
+
     @property
     def secrets(self):
-        return [
-            BitwardenSyncConfigSecret(item) for item in self.spec.get("secrets", [])
-        ]
+        return self.compiled('secrets', self.__compile_secrets)
 
     # DEPRECATED - The sync config label now uses uid to avoid name length issues.
+    @property
+    def snapshot_max_age(self):
+        """
+        Maximum age of snapshot used to sync a BitwardenSyncSecret alone, extended
+        to the poll interval while change notifications keep the snapshot current.
+        """
+        if BitwardenWebhook.enabled():
+            return max(self.targeted_sync_max_age, self.poll_interval)
+        return self.targeted_sync_max_age
+
     @property
     def sync_config_value(self):
         return f"{self.namespace}.{self.name}"
 
+    @property
+    def status_mode(self):
+        return self.spec.get('statusMode', 'full')
+
+    @property
+    def sync_request(self):
+        return (self.annotations or {}).get(K8sUtil.sync_request_annotation)
+
     @property
     def sync_interval(self):
-        return self.spec.get('syncInterval', 300)
+        return BitwardenSyncInterval.interval(self.spec, self.adaptive_sync_interval)
+
+    @property
+    def sync_interval_bounds(self):
+        """
+        Minimum and maximum sync interval when adaptive sync interval is configured.
+        """
+        return BitwardenSyncInterval.bounds(self.spec)
+
+    def __compile_secrets(self):
+        secrets = tuple(
+            BitwardenSyncConfigSecret(item) for item in self.spec.get("secrets", [])
+        )
+        BitwardenSyncIndex.update(
+            owner=self,
+            secret_configs=[
+                (self.get_index_namespace(secret_config), secret_config)
+                for secret_config in secrets
+            ],
+            project=self.project,
+        )
+        return secrets
+
+    async def delete_orphaned_secrets(self, status_entries, logger):
+        """
+        Delete Secrets which were managed for this config but are no longer configured.
+        """
+        secret_refs = {(entry['namespace'], entry['name']) for entry in status_entries}
+        if self.sync_status_entries is not None:
+            previous_secret_refs = set(self.sync_status_entries.keys())
+        elif self.status and self.status.get('secrets'):
+            previous_secret_refs = {
+                (secret_ref['namespace'], secret_ref['name']) for secret_ref in self.status['secrets']
+            }
+        elif self.status and self.status.get('secretsDigest'):
+            # Compact status only records a digest of the previous set
+            if self.status['secretsDigest'] == BitwardenSyncStatus.secrets_digest(secret_refs):
+                return
+            previous_secret_refs = await self.list_managed_secret_refs()
+        else:
+            return
+        for namespace, name in previous_secret_refs - secret_refs:
+            await check_delete_secret(managed_by=self, name=name, namespace=namespace, logger=logger)
 
     async def delete_secrets(self, logger):
         if not self.status:
             return
-        secrets = self.status.get('secrets')
-        if not secrets:
+        if self.status.get('secrets'):
+            secret_refs = [
+                (secret_ref['namespace'], secret_ref['name']) for secret_ref in self.status['secrets']
+            ]
+        elif self.status.get('secretsDigest'):
+            secret_refs = await self.list_managed_secret_refs()
+        else:
             return
-        for secret_ref in secrets:
-            name = secret_ref['name']
-            namespace = secret_ref['namespace']
+        for namespace, name in secret_refs:
             await check_delete_secret(managed_by=self, name=name, namespace=namespace, logger=logger)
 
+    async def list_managed_secret_refs(self):
+        """
+        List (namespace, name) of Secrets labeled as managed by this config.
+        """
+        secret_list = await K8sUtil.core_v1_api.list_secret_for_all_namespaces(
+            label_selector=f"{K8sUtil.sync_config_label}={self.uid}",
+        )
+        return {
+            (secret.metadata.namespace, secret.metadata.name) for secret in secret_list.items
+        }
+
     async def get_access_token(self):
         try:
             token_secret = await K8sUtil.core_v1_api.read_namespaced_secret(
@@ -99,18 +290,8 @@ class BitwardenSyncConfig(CachedK8sObject):
 
         return b64decode(token_secret.data['token']).decode('utf-8')
 
-    async def get_bitwarden_secrets(self):
-        return await BitwardenSecrets.get(access_token=bitwarden_access_token, project=self.project)
-
-    async def sync_secrets(self, logger):
-        self.sync_pending = False
-
-        bitwarden_access_token = await self.get_access_token()
-        try:
-            bitwarden_projects = await BitwardenProjects.get(bitwarden_access_token)
-        except BitwardenSyncError as err:
-            logger.error(f"Failed getting Bitwarden projects for {self}: {err}")
-            return
+    async def get_bitwarden_snapshot(self, bitwarden_access_token):
+        bitwarden_projects = await BitwardenProjects.get(bitwarden_access_token)
 
         bitwarden_project = None
         if self.project:
@@ -118,63 +299,520 @@ class BitwardenSyncConfig(CachedK8sObject):
             if not bitwarden_project:
                 raise BitwardenSyncError(f"Bitwarden project {self.project} not found")
 
+        bitwarden_secrets = await BitwardenSecrets.get(
+            bitwarden_access_token,
+            project_id=(bitwarden_project.id if bitwarden_project else None),
+            projects=bitwarden_projects,
+            refs=self.bitwarden_refs,
+        )
+
+        if bitwarden_secrets.definitions is not None:
+            token_digest = sha256(bitwarden_access_token.encode('utf-8')).hexdigest()
+            if bitwarden_secrets.refs is None:
+                BitwardenSnapshotCache.put_projects(token_digest, [
+                    {"id": project.id, "name": project.name}
+                    for project in bitwarden_projects.projects_dict.values()
+                ])
+                BitwardenSnapshotCache.put_secrets(
+                    token_digest, bitwarden_project.id if bitwarden_project else None, bitwarden_secrets.definitions,
+                )
+            else:
+                # Keep persisted values as recent as those applied from selective fetches
+                BitwardenSnapshotCache.merge_secrets(token_digest, bitwarden_secrets.definitions)
+            # Release definitions not held by the snapshot cache
+            bitwarden_secrets.definitions = None
+        return bitwarden_projects, bitwarden_secrets
+
+    async def record_sync_failure(self, breaker, error, token_digest):
+        """
+        Delay the next sync of this config with exponential backoff.
+        """
+        if self.backoff_delays is None or token_digest != self.backoff_token_digest:
+            self.backoff_delays = iter(InfiniteRelativeBackoff(
+                initial_delay=self.sync_interval,
+                jitter=self.backoff_jitter,
+                maximum=max(self.backoff_maximum, self.sync_interval),
+            ))
+            self.sync_failures = 0
+        self.backoff_token_digest = token_digest
+        self.retry_after = time() + next(self.backoff_delays)
+        self.sync_error = f"{error}"
+        self.sync_failures += 1
+        await self.update_backoff_status(breaker=breaker)
+
+    async def load_cached_snapshot(self, token_digest):
+        """
+        Use persisted Bitwarden listings as the last snapshot after restart.
+        """
+        cached = BitwardenSnapshotCache.get(token_digest, project_name=self.project)
+        if cached:
+            project_definitions, secret_definitions = cached
+            self.bitwarden_projects = BitwardenProjects(project_definitions)
+            self.bitwarden_secrets = await BitwardenSecrets.decode(secret_definitions)
+
+    async def load_resume_snapshot(self, logger):
+        """
+        Load persisted snapshot on resume so that drift repair does not wait for
+        the resume sync, which may be delayed by the admission queue.
+        """
+        if not BitwardenSnapshotCache.is_active() or self.bitwarden_secrets is not None:
+            return
         try:
-            bitwarden_secrets = await BitwardenSecrets.get(
-                bitwarden_access_token,
-                project_id=(bitwarden_project.id if bitwarden_project else None),
+            bitwarden_access_token = await self.get_access_token()
+        except (BitwardenSyncError, kubernetes_asyncio.client.rest.ApiException) as err:
+            logger.warning(f"Unable to load persisted Bitwarden snapshot for {self}: {err}")
+            return
+        await self.load_cached_snapshot(sha256(bitwarden_access_token.encode('utf-8')).hexdigest())
+
+    def queue_resume_sync(self, logger):
+        """
+        Queue sync through admission queue so that resume does not sync every config at once.
+        """
+        priority = self.resume_priority
+        # Spread syncs of healthy configs across the interval
+        delay = 0
+        if priority == 2:
+            delay = random.uniform(0, self.resume_sync_spread or self.sync_interval)
+        self.queue_sync(delay=delay, logger=logger, priority=priority)
+
+    def queue_sync(self, logger, priority, delay=0):
+        """
+        Queue sync through admission queue unless already queued.
+        """
+        async def sync():
+            # Skip if deleted or replaced while queued
+            if self.cache.get((self.namespace, self.name)) is self:
+                await self.sync_secrets(logger=logger)
+
+        SyncAdmissionQueue.submit(
+            delay=delay,
+            key=(self.kind, self.namespace, self.name),
+            logger=logger,
+            priority=priority,
+            sync=sync,
+        )
+
+    async def repair_secret(self, name, namespace, logger):
+        """
+        Re-render one target from the cached Bitwarden snapshot without calling bws.
+        """
+        if self.bitwarden_secrets is None:
+            self.sync_pending = True
+            return
+        async with self.lock:
+            for secret_config in self.secrets:
+                if secret_config.name != name or not self.is_secret_namespace(secret_config, namespace):
+                    continue
+                try:
+                    await manage_secret(
+                        bitwarden_projects=self.bitwarden_projects,
+                        bitwarden_secrets=self.bitwarden_secrets,
+                        managed_by=self,
+                        name=name,
+                        namespace=namespace,
+                        secret_config=secret_config,
+                        logger=logger,
+                    )
+                    logger.info(f"Repaired Secret {name} in {namespace} for {self}")
+                except BitwardenSyncError as err:
+                    logger.error(f"Failed to repair Secret {name} in {namespace} for {self}: {err}")
+                return
+
+    async def sync_bitwarden_sync_secret(self, secret, logger):
+        """
+        Sync one BitwardenSyncSecret from a recent Bitwarden snapshot without calling bws.
+
+        Falls back to a full sync of the config when the snapshot is stale or was
+        not fetched for every reference of the BitwardenSyncSecret.
+        """
+        if (
+            self.bitwarden_secrets is None or
+            time() - self.snapshot_time > self.snapshot_max_age or
+            not self.bitwarden_secrets.covers(BitwardenSyncIndex.secret_config_refs(secret.secret_config))
+        ):
+            self.sync_pending = True
+            return
+        async with self.lock:
+            await secret.sync_secret(
+                bitwarden_projects=self.bitwarden_projects,
+                bitwarden_secrets=self.bitwarden_secrets,
+                logger=logger,
             )
+
+    def reset_sync_failures(self):
+        self.backoff_delays = None
+        self.backoff_token_digest = None
+        self.retry_after = 0
+        self.sync_error = None
+        self.sync_failures = 0
+
+    async def update_backoff_status(self, breaker):
+        """
+        Report backoff and circuit breaker state in status, patching only on change.
+        """
+        backoff = {}
+        if self.sync_failures:
+            backoff['failures'] = self.sync_failures
+            backoff['retryAfter'] = datetime.fromtimestamp(
+                self.retry_after, timezone.utc
+            ).strftime('%FT%TZ')
+        if breaker.state != 'closed':
+            backoff['circuitBreaker'] = {
+                "state": breaker.state,
+                "retryAfter": datetime.fromtimestamp(
+                    breaker.open_until, timezone.utc
+                ).strftime('%FT%TZ'),
+            }
+        if backoff and self.sync_error:
+            backoff['error'] = self.sync_error
+        previous_backoff = dict((self.status or {}).get('backoff') or {})
+        if backoff == previous_backoff:
+            return
+        await self.merge_patch_status({
+            # Merge patch would otherwise retain keys which are no longer set
+            "backoff": {key: None for key in previous_backoff} | backoff if backoff else None,
+        })
+
+    def adapt_sync_interval(self, changed_refs):
+        """
+        Shorten sync interval after changes to referenced Bitwarden secrets and
+        lengthen it while they are unchanged.
+        """
+        self.adaptive_sync_interval = BitwardenSyncInterval.adapt(
+            spec=self.spec,
+            adaptive_interval=self.adaptive_sync_interval,
+            bitwarden_refs=self.bitwarden_refs,
+            changed_refs=changed_refs,
+        )
+
+    def get_sync_targets(self, bitwarden_projects, changed_refs, full_sync=False):
+        """
+        Return targets affected by Bitwarden changes since the last sync.
+
+        Returns None when every target must be synced.
+        """
+        if (
+            full_sync or
+            changed_refs is None or
+            self.last_sync_generation != self.generation or
+            time() >= self.last_full_sync + self.full_sync_interval or
+            {name: project.id for name, project in bitwarden_projects.projects_dict.items()} !=
+            {name: project.id for name, project in self.bitwarden_projects.projects_dict.items()} or
+            self.sync_status_entries is None or
+            any(
+                entry.get('state') not in ('pending', 'synced')
+                for entry in self.sync_status_entries.values()
+            ) or
+            BitwardenSyncSecret.any_unsynced_for_config(config=self)
+        ):
+            return None
+        return BitwardenSyncIndex.get_targets(changed_refs)
+
+    async def sync_secrets(self, logger, force=False, sync_targets=None):
+        """
+        Sync with a fresh Bitwarden snapshot, returning whether the sync ran.
+
+        Force ignores failure backoff. Targets in sync_targets are synced even if
+        not affected by Bitwarden changes.
+        """
+        async with self.lock:
+            with SyncProfiler.profile(name=f"{self}"):
+                return await self.__sync_secrets(logger=logger, force=force, sync_targets=sync_targets)
+
+    async def __sync_secrets(self, logger, force, sync_targets):
+        self.last_sync = time()
+        full_sync = self.sync_pending
+        self.sync_pending = False
+
+        bitwarden_access_token = await self.get_access_token()
+        token_digest = sha256(bitwarden_access_token.encode('utf-8')).hexdigest()
+        if self.bitwarden_secrets is None:
+            await self.load_cached_snapshot(token_digest)
+        if not force and token_digest == self.backoff_token_digest and time() < self.retry_after:
+            # Backing off, a changed access token is retried immediately
+            self.sync_pending = self.sync_pending or full_sync
+            return False
+
+        breaker = BitwardenCircuitBreaker.get(bitwarden_access_token)
+        if not breaker.allow_request():
+            # Paused with all other configs using this token until a probe succeeds
+            self.sync_pending = self.sync_pending or full_sync
+            self.backoff_token_digest = token_digest
+            self.retry_after = breaker.open_until
+            await self.update_backoff_status(breaker=breaker)
+            return False
+
+        try:
+            bitwarden_projects, bitwarden_secrets = await self.get_bitwarden_snapshot(bitwarden_access_token)
         except BitwardenSyncError as err:
+            breaker.record_failure(err)
             logger.error(f"Failed getting Bitwarden secrets for {self}: {err}")
-            return
+            self.sync_pending = self.sync_pending or full_sync
+            await self.record_sync_failure(breaker=breaker, error=err, token_digest=token_digest)
+            if (
+                self.sync_status_entries is None and
+                self.bitwarden_secrets is not None and
+                not self.snapshot_verified
+            ):
+                await self.verify_from_snapshot(logger=logger)
+            return False
+        except Exception as err:
+            breaker.record_failure(err)
+            raise
+        finally:
+            # Probe cancelled without a result must not keep the circuit half-open
+            breaker.release_probe()
+        breaker.record_success()
+        if self.backoff_token_digest:
+            self.reset_sync_failures()
+            await self.update_backoff_status(breaker=breaker)
 
+        changed_refs = None
+        if self.bitwarden_secrets is not None:
+            changed_refs = bitwarden_secrets.changed_refs(self.bitwarden_secrets, bitwarden_projects)
+        self.adapt_sync_interval(changed_refs)
+
+        targets = self.get_sync_targets(
+            bitwarden_projects=bitwarden_projects,
+            changed_refs=changed_refs,
+            full_sync=full_sync,
+        )
+        if targets is not None and sync_targets:
+            targets |= set(sync_targets)
+
+        previous_status_entries = self.sync_status_entries or {}
         status_entries = []
         for secret_config in self.secrets:
             name = secret_config.name
-            namespace = secret_config.namespace or self.namespace
-            status_entry = {
-                "name": name,
-                "namespace": namespace,
-            }
-            status_entries.append(status_entry)
-            try:
-                secret = await manage_secret(
-                    bitwarden_projects=bitwarden_projects,
-                    bitwarden_secrets=bitwarden_secrets,
-                    managed_by=self,
-                    name=name,
-                    namespace=namespace,
-                    secret_config=secret_config,
+            namespaces = self.get_secret_namespaces(secret_config)
+            sync_namespaces = [
+                namespace for namespace in namespaces
+                if targets is None or
+                (namespace, name) not in previous_status_entries or
+                previous_status_entries[(namespace, name)].get('state') == 'pending' or
+                self.get_sync_target(secret_config) in targets or
+                BitwardenSyncTarget(self.kind, self.namespace, self.name, namespace, name) in targets
+            ]
+            synced_entries = await self.sync_secret_config(
+                bitwarden_projects=bitwarden_projects,
+                bitwarden_secrets=bitwarden_secrets,
+                logger=logger,
+                namespaces=sync_namespaces,
+                secret_config=secret_config,
+            )
+            for namespace in namespaces:
+                if namespace in synced_entries:
+                    status_entries.append(synced_entries[namespace])
+                else:
+                    # Unaffected by Bitwarden changes since last sync
+                    status_entries.append(dict(previous_status_entries[(namespace, name)]))
+
+        await self.delete_orphaned_secrets(status_entries=status_entries, logger=logger)
+        await self.update_status_entries(status_entries)
+
+        await BitwardenSyncSecret.sync_for_config(
+                bitwarden_projects=bitwarden_projects,
+                bitwarden_secrets=bitwarden_secrets,
+                config=self,
+                logger=logger,
+                targets=targets,
+        )
+
+        self.bitwarden_projects = bitwarden_projects
+        self.bitwarden_secrets = bitwarden_secrets
+        self.last_sync_generation = self.generation
+        self.snapshot_time = time()
+        if targets is None:
+            self.last_full_sync = time()
+        return True
+
+    async def verify_from_snapshot(self, logger):
+        """
+        Render targets from the persisted snapshot while Bitwarden is unavailable,
+        repairing any which changed or were deleted while the operator was not running.
+        """
+        self.snapshot_verified = True
+        logger.info(f"Verifying Secrets for {self} from persisted Bitwarden snapshot")
+        for secret_config in self.secrets:
+            await self.sync_secret_config(
+                bitwarden_projects=self.bitwarden_projects,
+                bitwarden_secrets=self.bitwarden_secrets,
+                logger=logger,
+                namespaces=self.get_secret_namespaces(secret_config),
+                secret_config=secret_config,
+            )
+        await BitwardenSyncSecret.sync_for_config(
+            bitwarden_projects=self.bitwarden_projects,
+            bitwarden_secrets=self.bitwarden_secrets,
+            config=self,
+            logger=logger,
+        )
+
+    def get_index_namespace(self, secret_config):
+        """
+        Target namespace in the dependency index, `*` for all namespaces matching a selector.
+        """
+        if secret_config.namespace_selector:
+            return '*'
+        return secret_config.namespace or self.namespace
+
+    def get_secret_namespaces(self, secret_config):
+        if secret_config.namespace_selector:
+            return sorted(
+                namespace for namespace, labels in K8sNamespaces.cache.items()
+                if secret_config.namespace_selector.matches(labels)
+            )
+        return [secret_config.namespace or self.namespace]
+
+    def get_sync_target(self, secret_config):
+        return BitwardenSyncTarget(
+            self.kind, self.namespace, self.name, self.get_index_namespace(secret_config), secret_config.name,
+        )
+
+    def is_secret_namespace(self, secret_config, namespace):
+        if secret_config.namespace_selector:
+            return secret_config.namespace_selector.matches(K8sNamespaces.get_labels(namespace))
+        return (secret_config.namespace or self.namespace) == namespace
+
+    def is_namespace_pending(self, secret_config, namespace, labels):
+        """
+        Return whether Secret has not yet been synced to namespace which is now available.
+        """
+        if secret_config.namespace_selector:
+            if not secret_config.namespace_selector.matches(labels):
+                return False
+        elif (secret_config.namespace or self.namespace) != namespace:
+            return False
+        return BitwardenSyncStatus.is_pending(self.sync_status_entries, namespace, secret_config.name)
+
+    async def on_namespace_deleted(self, namespace):
+        """
+        Mark Secrets in deleted namespace pending so that they are synced when it is created again.
+        """
+        async with self.lock:
+            status_entries = BitwardenSyncStatus.on_namespace_deleted(
+                self.sync_status_entries,
+                namespace=namespace,
+                fan_out_names={
+                    secret_config.name for secret_config in self.secrets if secret_config.namespace_selector
+                },
+            )
+            if status_entries is not None:
+                await self.update_status_entries(list(status_entries.values()))
+
+    async def sync_namespace(self, namespace, logger):
+        """
+        Sync Secrets to a namespace which was created or newly matches a
+        namespaceSelector from the last Bitwarden snapshot without calling bws.
+        """
+        if self.bitwarden_secrets is None or self.sync_status_entries is None:
+            self.sync_pending = True
+            return
+        async with self.lock:
+            status_entries = dict(self.sync_status_entries)
+            for secret_config in self.secrets:
+                if not self.is_namespace_pending(
+                    secret_config, namespace, K8sNamespaces.get_labels(namespace)
+                ):
+                    continue
+                synced_entries = await self.sync_secret_config(
+                    bitwarden_projects=self.bitwarden_projects,
+                    bitwarden_secrets=self.bitwarden_secrets,
                     logger=logger,
+                    namespaces=[namespace],
+                    secret_config=secret_config,
                 )
-                status_entry['uid'] = secret.metadata.uid
-                status_entry['state'] = 'synced'
-            except BitwardenSyncError as err:
-                logger.error(f"Failed to sync Secret {name} in {namespace} for {self}: {err}")
+                status_entries[(namespace, secret_config.name)] = synced_entries[namespace]
+            if status_entries != self.sync_status_entries:
+                await self.update_status_entries(list(status_entries.values()))
+
+    async def sync_secret_config(self, bitwarden_projects, bitwarden_secrets, logger, namespaces, secret_config):
+        """
+        Render Secret once and apply it to namespaces concurrently.
+
+        Returns status entries by namespace.
+        """
+        name = secret_config.name
+        status_entries = {
+            namespace: {"name": name, "namespace": namespace} for namespace in namespaces
+        }
+        for namespace in namespaces:
+            if not K8sNamespaces.exists(namespace):
+                # Synced without an API call when the namespace is created
+                status_entries[namespace] = BitwardenSyncStatus.pending_entry(namespace, name)
+        apply_entries = [
+            status_entry for status_entry in status_entries.values() if 'state' not in status_entry
+        ]
+        if not apply_entries:
+            return status_entries
+        try:
+            rendered = render_secret(
+                bitwarden_projects=bitwarden_projects,
+                bitwarden_secrets=bitwarden_secrets,
+                managed_by=self,
+                secret_config=secret_config,
+            )
+        except BitwardenSyncError as err:
+            logger.error(f"Failed to render Secret {name} for {self}: {err}")
+            for status_entry in apply_entries:
                 status_entry['state'] = 'failed'
                 status_entry['error'] = f"{err}"
-            # pylint: disable-next=broad-except
-            except Exception as err:
-                logger.exception(f"Error syncing Secret {name} in {namespace} for {self}")
+            return status_entries
+        # pylint: disable-next=broad-except
+        except Exception as err:
+            logger.exception(f"Error rendering Secret {name} for {self}")
+            for status_entry in apply_entries:
                 status_entry['state'] = 'error'
                 status_entry['error'] = f"{err}"
+            return status_entries
 
-        if self.status and 'secrets' in self.status:
-            for secret_ref in self.status['secrets']:
-                name = secret_ref['name']
-                namespace = secret_ref['namespace']
-                for status_entry in status_entries:
-                    if name == status_entry['name'] and namespace == status_entry['namespace']:
-                        break
-                else:
-                    await check_delete_secret(managed_by=self, name=name, namespace=namespace, logger=logger)
+        semaphore = asyncio.Semaphore(self.fan_out_concurrency)
 
-        await self.merge_patch_status({
-            "secrets": status_entries,
-        })
+        async def apply(status_entry):
+            namespace = status_entry['namespace']
+            async with semaphore:
+                try:
+                    secret = await apply_secret(
+                        logger=logger,
+                        managed_by=self,
+                        name=name,
+                        namespace=namespace,
+                        rendered=rendered,
+                        secret_config=secret_config,
+                    )
+                    status_entry['uid'] = secret.metadata.uid
+                    status_entry['state'] = 'synced'
+                except BitwardenSyncError as err:
+                    logger.error(f"Failed to sync Secret {name} in {namespace} for {self}: {err}")
+                    status_entry['state'] = 'failed'
+                    status_entry['error'] = f"{err}"
+                # pylint: disable-next=broad-except
+                except Exception as err:
+                    logger.exception(f"Error syncing Secret {name} in {namespace} for {self}")
+                    status_entry['state'] = 'error'
+                    status_entry['error'] = f"{err}"
 
-        await BitwardenSyncSecret.sync_for_config(
-                bitwarden_projects=bitwarden_projects,
-                bitwarden_secrets=bitwarden_secrets,
-                config=self,
-                logger=logger,
+        await asyncio.gather(*[apply(status_entry) for status_entry in apply_entries])
+        return status_entries
+
+    async def update_status_entries(self, status_entries):
+        """
+        Record status entries, patching status only on change.
+        """
+        status_patch = BitwardenSyncStatus.build_patch(
+            status_entries, compact=self.status_mode == 'compact',
         )
+        status_patch['syncInterval'] = round(self.sync_interval) if self.sync_interval_bounds else None
+        if any(
+            value != (self.status or {}).get(key) for key, value in status_patch.items()
+        ):
+            await self.merge_patch_status(status_patch)
+        self.sync_status_entries = {
+            (entry['namespace'], entry['name']): entry for entry in status_entries
+        }
+
+    def get_status_entry(self, name, namespace):
+        """
+        Return status entry of target from the last sync.
+        """
+        return (self.sync_status_entries or {}).get((namespace, name))
@@ -1,21 +1,29 @@
+from types import MappingProxyType
+
 from bitwardensyncconfigsecretsource import BitwardenSyncConfigSecretSource
+from labelselector import LabelSelector
 
 class BitwardenSyncConfigSecret:
     # pylint: disable=too-few-public-methods
     def __init__(self, definition):
         self.action = definition.get('action', 'replace')
-        self.secret_annotations = {
+        self.secret_annotations = MappingProxyType({
             key: BitwardenSyncConfigSecretSource(value)
             for key, value in definition.get('annotations', {}).items()
-        }
-        self.secret_data = {
+        })
+        self.secret_data = MappingProxyType({
             key: BitwardenSyncConfigSecretSource(value)
             for key, value in definition.get('data', {}).items()
-        }
-        self.secret_labels = {
+        })
+        self.secret_labels = MappingProxyType({
             key: BitwardenSyncConfigSecretSource(value)
             for key, value in definition.get('labels', {}).items()
-        }
+        })
         self.name = definition['name']
         self.namespace = definition.get('namespace')
+        # Replicate to every namespace matching selector rather than a single namespace
+        self.namespace_selector = (
+            LabelSelector.from_dict(definition['namespaceSelector'])
+            if 'namespaceSelector' in definition else None
+        )
         self.type = definition.get('type', 'Opaque')
@@ -1,3 +1,7 @@
+from base64 import b64encode
+from string import Template
+from types import MappingProxyType
+
 class BitwardenSyncConfigSecretSource:
     # pylint: disable=too-few-public-methods
     def __init__(self, definition):
@@ -5,4 +9,20 @@ class BitwardenSyncConfigSecretSource:
         self.key = definition.get('key')
         self.project = definition.get('project')
         self.secret = definition.get('secret')
+        self.template = definition.get('template')
         self.value = definition.get('value')
+
+        # Deep key path with `.` delimiters, split once when the spec is compiled.
+        self.key_path = tuple(self.key.split('.')) if self.key else ()
+
+        # Literal values are encoded once rather than on every sync.
+        self.encoded_value = (
+            b64encode(self.value.encode('utf-8')).decode('utf-8') if self.value else None
+        )
+
+        # Templates are parsed once, template vars default to the template project.
+        self.compiled_template = Template(self.template) if self.template is not None else None
+        self.template_vars = MappingProxyType({
+            name: BitwardenSyncConfigSecretSource({"project": self.project, **var})
+            for name, var in definition.get('vars', {}).items()
+        })
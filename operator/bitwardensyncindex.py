@@ -0,0 +1,99 @@
+from collections import namedtuple
+
+BitwardenSyncTarget = namedtuple(
+    'BitwardenSyncTarget',
+    ['kind', 'namespace', 'name', 'secret_namespace', 'secret_name'],
+)
+
+class BitwardenSyncIndex:
+    """
+    Reverse index from Bitwarden secret references to the Kubernetes Secrets they feed.
+
+    References are `(project, key)` tuples where project is the Bitwarden project
+    name or None when the source does not restrict the project.
+    """
+    # Targets by reference
+    refs = {}
+    # References and targets by owner, for removal when the owner changes
+    owners = {}
+
+    @classmethod
+    def source_refs(cls, sources, project=None):
+        refs = set()
+        for src in sources.values():
+            if src.secret:
+                refs.add((src.project or project, src.secret))
+            if src.template_vars:
+                refs.update(cls.source_refs(src.template_vars, project=project))
+        return refs
+
+    @classmethod
+    def secret_config_refs(cls, secret_config, project=None):
+        refs = set()
+        for sources in (
+            secret_config.secret_annotations,
+            secret_config.secret_data,
+            secret_config.secret_labels,
+        ):
+            refs.update(cls.source_refs(sources, project=project))
+        return refs
+
+    @classmethod
+    def clear(cls):
+        cls.refs.clear()
+        cls.owners.clear()
+
+    @classmethod
+    def get_targets(cls, refs):
+        """
+        Return set of targets which depend on any of the references.
+
+        References without a project match targets with any project restriction.
+        """
+        targets = set()
+        for project, key in refs:
+            targets.update(cls.refs.get((project, key), ()))
+            targets.update(cls.refs.get((None, key), ()))
+            if project is None:
+                for (_, ref_key), ref_targets in cls.refs.items():
+                    if ref_key == key:
+                        targets.update(ref_targets)
+        return targets
+
+    @classmethod
+    def query(cls, key, project=None):
+        """
+        Return targets fed by Bitwarden secret key for impact analysis.
+        """
+        return [
+            target._asdict() for target in sorted(cls.get_targets([(project, key)]))
+        ]
+
+    @classmethod
+    def remove(cls, owner):
+        for ref, target in cls.owners.pop((owner.kind, owner.namespace, owner.name), ()):
+            targets = cls.refs.get(ref)
+            if targets is None:
+                continue
+            targets.discard(target)
+            if not targets:
+                del cls.refs[ref]
+
+    @classmethod
+    def update(cls, owner, secret_configs, project=None):
+        """
+        Replace index entries for owner from its compiled secret configurations.
+
+        Each item of secret_configs is a (namespace, secret_config) tuple.
+        """
+        cls.remove(owner)
+        entries = set()
+        for namespace, secret_config in secret_configs:
+            target = BitwardenSyncTarget(
+                owner.kind, owner.namespace, owner.name, namespace, secret_config.name,
+            )
+            for ref in cls.secret_config_refs(secret_config, project=project):
+                entries.add((ref, target))
+        for ref, target in entries:
+            cls.refs.setdefault(ref, set()).add(target)
+        cls.owners[(owner.kind, owner.namespace, owner.name)] = entries
@@ -0,0 +1,63 @@
+import os
+
+class BitwardenSyncInterval:
+    """
+    Sync interval of a BitwardenSyncConfig, adapted within adaptiveSyncInterval
+    bounds to how often referenced Bitwarden secrets change.
+    """
+    # Adaptive sync interval factors after a sync with and without changes
+    decrease = float(os.environ.get('ADAPTIVE_SYNC_DECREASE', 0.5))
+    increase = float(os.environ.get('ADAPTIVE_SYNC_INCREASE', 1.5))
+
+    @staticmethod
+    def bounds(spec):
+        """
+        Minimum and maximum sync interval when adaptive sync interval is configured.
+        """
+        adaptive = spec.get('adaptiveSyncInterval')
+        if adaptive is None:
+            return None
+        minimum = adaptive.get('minimum', 60)
+        return minimum, max(adaptive.get('maximum', 3600), minimum)
+
+    @classmethod
+    def interval(cls, spec, adaptive_interval):
+        """
+        Return syncInterval, or adaptive interval clamped to bounds.
+        """
+        interval = spec.get('syncInterval', 300)
+        bounds = cls.bounds(spec)
+        if not bounds:
+            return interval
+        return min(max(adaptive_interval or interval, bounds[0]), bounds[1])
+
+    @staticmethod
+    def is_changed(bitwarden_refs, changed_refs):
+        """
+        Return whether any referenced (project, key) is in changed_refs, where a
+        project of None matches any project.
+        """
+        changed_keys = {key for _, key in changed_refs}
+        return any(
+            key in changed_keys and (
+                project is None or (project, key) in changed_refs or (None, key) in changed_refs
+            )
+            for project, key in bitwarden_refs
+        )
+
+    @classmethod
+    def adapt(cls, spec, adaptive_interval, bitwarden_refs, changed_refs):
+        """
+        Return adaptive interval shortened after changes to referenced Bitwarden
+        secrets and lengthened while they are unchanged.
+
+        Returns None without adaptive sync interval and adaptive_interval when
+        changes are unknown.
+        """
+        if not cls.bounds(spec):
+            return None
+        if changed_refs is None:
+            return adaptive_interval
+        return cls.interval(spec, adaptive_interval) * (
+            cls.decrease if cls.is_changed(bitwarden_refs, changed_refs) else cls.increase
+        )
@@ -3,8 +3,9 @@ import kubernetes_asyncio
 import bitwardensyncconfig
 
 from k8sutil import CachedK8sObject, K8sUtil
-from bitwardensyncconfigsecretsource import BitwardenSyncConfigSecretSource
+from bitwardensyncconfigsecret import BitwardenSyncConfigSecret
 from bitwardensyncerror import BitwardenSyncError
+from bitwardensyncindex import BitwardenSyncIndex, BitwardenSyncTarget
 from bitwardensyncutil import check_delete_secret, manage_secret
 
 class BitwardenSyncSecret(CachedK8sObject):
@@ -21,13 +22,14 @@ class BitwardenSyncSecret(CachedK8sObject):
         secret = cls.register(**kwargs)
         config = bitwardensyncconfig.BitwardenSyncConfig.cache.get((secret.config_namespace, secret.config_name))
         if config:
-            config.sync_pending = True
+            await config.sync_bitwarden_sync_secret(secret=secret, logger=logger)
         logger.info(f"{secret} created")
 
     @classmethod
     async def on_delete(cls, logger, **kwargs):
         secret = cls(**kwargs)
         await secret.handle_delete(logger=logger)
+        BitwardenSyncIndex.remove(secret)
         secret.unregister()
         logger.info(f"{secret} deleted")
 
@@ -40,20 +42,43 @@ class BitwardenSyncSecret(CachedK8sObject):
     async def on_update(cls, logger, **kwargs):
         secret = cls.register(**kwargs)
         config = bitwardensyncconfig.BitwardenSyncConfig.cache.get((secret.config_namespace, secret.config_name))
-        if config:
-            config.sync_pending = True
+        if secret.sync_request != secret.handled_sync_request:
+            # Sync requested by annotation, sync with fresh data from Bitwarden
+            secret.handled_sync_request = secret.sync_request
+            if config:
+                await config.sync_secrets(force=True, logger=logger, sync_targets={secret.sync_target})
+        elif config:
+            await config.sync_bitwarden_sync_secret(secret=secret, logger=logger)
         logger.info(f"{secret} updated")
 
     @classmethod
-    async def sync_for_config(cls, bitwarden_projects, bitwarden_secrets, config, logger):
-        for secret in cls.cache.values():
-            if secret.config_name == config.name and secret.config_namespace == config.namespace:
+    def any_unsynced_for_config(cls, config):
+        for secret in cls.for_config(config):
+            if (secret.status or {}).get('state') != 'synced':
+                return True
+        return False
+
+    @classmethod
+    def for_config(cls, config):
+        return [
+            secret for secret in cls.cache.values()
+            if secret.config_name == config.name and secret.config_namespace == config.namespace
+        ]
+
+    @classmethod
+    async def sync_for_config(cls, bitwarden_projects, bitwarden_secrets, config, logger, targets=None):
+        for secret in cls.for_config(config):
+            if targets is None or secret.sync_target in targets:
                 await secret.sync_secret(
                     bitwarden_projects=bitwarden_projects,
                     bitwarden_secrets=bitwarden_secrets,
                     logger=logger,
                 )
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.handled_sync_request = self.sync_request
+
     @property
     def action(self):
         return self.spec.get('action', 'replace')
@@ -72,24 +97,27 @@ class BitwardenSyncSecret(CachedK8sObject):
 
     @property
     def secret_annotations(self):
-        return {
-            key: BitwardenSyncConfigSecretSource(value)
-            for key, value in self.spec.get('annotations', {}).items()
-        }
+        return self.secret_config.secret_annotations
+
+    @property
+    def secret_config(self):
+        return self.compiled('secret_config', self.__compile_secret_config)
 
     @property
     def secret_data(self):
-        return {
-            key: BitwardenSyncConfigSecretSource(value)
-            for key, value in self.spec.get('data', {}).items()
-        }
+        return self.secret_config.secret_data
 
     @property
     def secret_labels(self):
-        return {
-            key: BitwardenSyncConfigSecretSource(value)
-            for key, value in self.spec.get('labels', {}).items()
-        }
+        return self.secret_config.secret_labels
+
+    @property
+    def sync_request(self):
+        return (self.annotations or {}).get(K8sUtil.sync_request_annotation)
+
+    @property
+    def sync_target(self):
+        return BitwardenSyncTarget(self.kind, self.namespace, self.name, self.namespace, self.name)
 
     # DEPRECATED - The sync config label now uses uid to avoid name length issues.
     @property
@@ -100,6 +128,15 @@ class BitwardenSyncSecret(CachedK8sObject):
     def type(self):
         return self.spec.get('type', 'Opaque')
 
+    def __compile_secret_config(self):
+        secret_config = BitwardenSyncConfigSecret({
+            **self.spec,
+            "name": self.name,
+            "namespace": self.namespace,
+        })
+        BitwardenSyncIndex.update(owner=self, secret_configs=[(self.namespace, secret_config)])
+        return secret_config
+
     async def handle_delete(self, logger):
         await check_delete_secret(
             managed_by=self,
@@ -108,6 +145,26 @@ class BitwardenSyncSecret(CachedK8sObject):
             logger=logger,
         )
 
+    async def repair_secret(self, name, namespace, logger):
+        """
+        Re-render Secret from the cached Bitwarden snapshot of the config without calling bws.
+        """
+        if name != self.name or namespace != self.namespace:
+            return
+        config = bitwardensyncconfig.BitwardenSyncConfig.cache.get((self.config_namespace, self.config_name))
+        if not config:
+            return
+        if config.bitwarden_secrets is None:
+            config.sync_pending = True
+            return
+        async with config.lock:
+            await self.sync_secret(
+                bitwarden_projects=config.bitwarden_projects,
+                bitwarden_secrets=config.bitwarden_secrets,
+                logger=logger,
+            )
+        logger.info(f"Repaired Secret for {self}")
+
     async def sync_secret(self, bitwarden_projects, bitwarden_secrets, logger):
         try:
             secret = await manage_secret(
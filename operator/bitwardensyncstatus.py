@@ -0,0 +1,89 @@
+from hashlib import sha256
+
+class BitwardenSyncStatus:
+    """
+    Status entries of a BitwardenSyncConfig by target (namespace, name).
+    """
+
+    # Maximum failed entries listed in compact status
+    failed_secrets_limit = 20
+
+    @classmethod
+    def build_patch(cls, status_entries, compact=False):
+        """
+        Return status patch listing every entry, or with compact status a summary
+        of states, the first failed entries, and a digest of targets.
+
+        Pending entries are only counted in the summary as they wait for their
+        namespace rather than having failed.
+        """
+        if not compact:
+            return {
+                "failedSecrets": None,
+                "failedSecretsTruncated": None,
+                "secrets": status_entries,
+                "secretsDigest": None,
+                "summary": None,
+            }
+        summary = {"total": len(status_entries)}
+        for entry in status_entries:
+            summary[entry['state']] = summary.get(entry['state'], 0) + 1
+        failed_entries = [
+            entry for entry in status_entries if entry['state'] not in ('pending', 'synced')
+        ]
+        truncated = len(failed_entries) - cls.failed_secrets_limit
+        return {
+            "failedSecrets": failed_entries[:cls.failed_secrets_limit],
+            "failedSecretsTruncated": truncated if truncated > 0 else None,
+            "secrets": None,
+            "secretsDigest": cls.secrets_digest(
+                (entry['namespace'], entry['name']) for entry in status_entries
+            ),
+            "summary": summary,
+        }
+
+    @staticmethod
+    def is_pending(status_entries, namespace, name):
+        """
+        Return whether target has not been synced or is waiting for its namespace.
+        """
+        status_entry = (status_entries or {}).get((namespace, name))
+        return status_entry is None or status_entry.get('state') == 'pending'
+
+    @staticmethod
+    def pending_entry(namespace, name):
+        return {
+            "error": f"Namespace {namespace} does not exist",
+            "name": name,
+            "namespace": namespace,
+            "state": "pending",
+        }
+
+    @staticmethod
+    def secrets_digest(secret_refs):
+        """
+        Digest of set of target (namespace, name) tuples.
+        """
+        return sha256(
+            "\n".join(f"{namespace}/{name}" for namespace, name in sorted(secret_refs)).encode('utf-8')
+        ).hexdigest()
+
+    @classmethod
+    def on_namespace_deleted(cls, status_entries, namespace, fan_out_names):
+        """
+        Return status entries after namespace deletion, or None if none changed.
+
+        Targets replicated by namespaceSelector are dropped while other targets
+        wait as pending for the namespace to be created again.
+        """
+        updated = {}
+        changed = False
+        for (entry_namespace, name), status_entry in (status_entries or {}).items():
+            if entry_namespace == namespace and name in fan_out_names:
+                changed = True
+                continue
+            if entry_namespace == namespace and status_entry.get('state') != 'pending':
+                status_entry = cls.pending_entry(namespace, name)
+                changed = True
+            updated[(entry_namespace, name)] = status_entry
+        return updated if changed else None
@@ -4,6 +4,7 @@ import kubernetes_asyncio
 
 from k8sutil import K8sUtil
 from bitwardensyncerror import BitwardenSyncError
+from driftrepair import DriftRepair
 
 # pylint: disable=too-many-arguments
 
@@ -39,12 +40,14 @@ async def check_delete_secret(
         )
         return
 
+    DriftRepair.record_delete(name=name, namespace=namespace)
     try:
         secret = await K8sUtil.core_v1_api.delete_namespaced_secret(
             name = name,
             namespace = namespace,
         )
     except kubernetes_asyncio.client.rest.ApiException as err:
+        DriftRepair.discard_delete(name=name, namespace=namespace)
         if err.status == 404:
             logger.info(
                 f"Did not find Secret {name} in {namespace} while deleting for {managed_by} after check"
@@ -59,6 +62,22 @@ async def check_delete_secret(
 async def manage_secret(
     bitwarden_projects, bitwarden_secrets, managed_by, name, namespace, secret_config, logger,
 ):
+    return await apply_secret(
+        logger=logger,
+        managed_by=managed_by,
+        name=name,
+        namespace=namespace,
+        rendered=render_secret(
+            bitwarden_projects=bitwarden_projects,
+            bitwarden_secrets=bitwarden_secrets,
+            managed_by=managed_by,
+            secret_config=secret_config,
+        ),
+        secret_config=secret_config,
+    )
+
+# Render Secret annotations, data, and labels, which may be applied in several namespaces
+def render_secret(bitwarden_projects, bitwarden_secrets, managed_by, secret_config):
     data = {
         key: value
         for key, value in bitwarden_secrets.get_values(
@@ -80,7 +99,10 @@ async def manage_secret(
     )
     labels['app.kubernetes.io/managed-by'] = 'bitwarden-k8s-secrets-manager'
     labels[K8sUtil.sync_config_label] = managed_by.uid
+    return annotations, data, labels
 
+async def apply_secret(logger, managed_by, name, namespace, rendered, secret_config):
+    annotations, data, labels = rendered
     secret = None
     try:
         secret = await K8sUtil.core_v1_api.read_namespaced_secret(
@@ -155,6 +177,7 @@ async def manage_secret(
                 )
                 logger.info(f"Updated Secret {name} in {namespace} for {managed_by}")
 
+        DriftRepair.record_write(secret)
         return secret
 
     secret = await K8sUtil.core_v1_api.create_namespaced_secret(
@@ -170,4 +193,5 @@ async def manage_secret(
         namespace = namespace,
     )
     logger.info(f"Created Secret {name} in {namespace} for {managed_by}")
+    DriftRepair.record_write(secret)
     return secret
@@ -0,0 +1,88 @@
+from collections import namedtuple
+from time import time
+
+import hashlib
+import hmac
+import json
+import os
+
+from bitwardenwebhookerror import BitwardenWebhookError
+
+BitwardenChangeEvent = namedtuple(
+    'BitwardenChangeEvent',
+    ['secret_id', 'key', 'project_id', 'project'],
+)
+
+class BitwardenWebhook:
+    """
+    Verification and parsing of Bitwarden change notifications.
+
+    Senders sign `<timestamp>.<body>` with HMAC-SHA256 using the shared secret and
+    send `X-Webhook-Timestamp` and `X-Webhook-Signature: sha256=<hexdigest>` headers.
+    """
+    secret = os.environ.get('WEBHOOK_SECRET', '')
+    # Polling interval used as a safety net while change notifications are received
+    poll_interval = int(os.environ.get('WEBHOOK_POLL_INTERVAL', 3600))
+    # Maximum age in seconds of a signed notification, to limit replay
+    tolerance = int(os.environ.get('WEBHOOK_TOLERANCE', 300))
+
+    @classmethod
+    def enabled(cls):
+        return bool(cls.secret)
+
+    @classmethod
+    def sign(cls, body, timestamp, secret=None):
+        return 'sha256=' + hmac.new(
+            (secret or cls.secret).encode('utf-8'),
+            f"{timestamp}.".encode('utf-8') + body,
+            hashlib.sha256,
+        ).hexdigest()
+
+    @classmethod
+    def verify(cls, body, signature, timestamp):
+        """
+        Raise BitwardenWebhookError unless the signature is valid and recent.
+        """
+        if not signature or not timestamp:
+            raise BitwardenWebhookError("missing signature")
+        try:
+            age = abs(time() - int(timestamp))
+        except ValueError as err:
+            raise BitwardenWebhookError("invalid timestamp") from err
+        if age > cls.tolerance:
+            raise BitwardenWebhookError("timestamp outside tolerance")
+        if not hmac.compare_digest(signature, cls.sign(body, timestamp)):
+            raise BitwardenWebhookError("invalid signature")
+
+    @staticmethod
+    def parse_events(body):
+        """
+        Return change events from notification body.
+
+        The body is a JSON object with an `events` list, or a single event object.
+        Each event names a changed secret by `secretId` or `key`, optionally with
+        `projectId` or `project` name.
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError as err:
+            raise BitwardenWebhookError(f"invalid JSON: {err}") from err
+        if not isinstance(payload, dict):
+            raise BitwardenWebhookError("notification must be an object")
+        items = payload.get('events', [payload])
+        if not isinstance(items, list):
+            raise BitwardenWebhookError("events must be a list")
+        events = []
+        for item in items:
+            if not isinstance(item, dict):
+                raise BitwardenWebhookError("event must be an object")
+            event = BitwardenChangeEvent(
+                secret_id=item.get('secretId'),
+                key=item.get('key'),
+                project_id=item.get('projectId'),
+                project=item.get('project'),
+            )
+            if not event.secret_id and not event.key:
+                raise BitwardenWebhookError("event must include secretId or key")
+            events.append(event)
+        return events
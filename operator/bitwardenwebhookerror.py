@@ -0,0 +1,2 @@
+class BitwardenWebhookError(Exception):
+    pass
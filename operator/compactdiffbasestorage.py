@@ -0,0 +1,30 @@
+from collections.abc import Mapping
+
+import kopf
+
+from diffbasecodec import DiffBaseCodec
+
+class CompactDiffBaseStorage(kopf.StatusDiffBaseStorage):
+    """
+    Status diffbase storage which may store the last handled configuration
+    compressed or as a hash, as set by DIFFBASE_MODE.
+    """
+
+    def fetch(self, *, body):
+        encoded = body
+        for key in self.field:
+            encoded = encoded.get(key) if isinstance(encoded, Mapping) else None
+        if encoded is None:
+            return None
+        if encoded.startswith(DiffBaseCodec.hash_prefix):
+            # Hash comparison requires the current configuration
+            return DiffBaseCodec.decode(encoded, self.build(body=body))
+        return DiffBaseCodec.decode(encoded)
+
+    def store(self, *, body, patch, essence):
+        encoded = DiffBaseCodec.encode(essence)
+        DiffBaseCodec.record(body.get('metadata', {}).get('uid'), essence, encoded)
+        target = patch
+        for key in self.field[:-1]:
+            target = target.setdefault(key, {})
+        target[self.field[-1]] = encoded
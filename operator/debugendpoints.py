@@ -0,0 +1,194 @@
+"""
+Debug and profiling endpoints, enabled with DEBUG_ENDPOINTS=true.
+
+Responses must never include Bitwarden secret values. Requests must send the
+sync API token if configured, otherwise they are only accepted from loopback
+addresses.
+"""
+
+import asyncio
+import sys
+import types
+
+from aiohttp import web
+
+from bitwardendecodepool import BitwardenDecodePool
+from bitwardensecrets import BitwardenSecrets
+from bitwardensnapshotcache import BitwardenSnapshotCache
+from bitwardensyncconfig import BitwardenSyncConfig
+from bitwardensyncindex import BitwardenSyncIndex
+from bitwardensyncsecret import BitwardenSyncSecret
+from diffbasecodec import DiffBaseCodec
+from httpserver import HttpServer
+from k8sutil import K8sUtil
+from looplagmonitor import LoopLagMonitor
+from memoryprofiler import MemoryProfiler
+from syncprofiler import SyncProfiler
+
+def approximate_size(obj, seen=None):
+    """
+    Approximate memory size of object including referenced objects.
+    """
+    seen = set() if seen is None else seen
+    # Do not follow references to the event loop, modules, or code
+    if id(obj) in seen or isinstance(obj, (
+        asyncio.Future, asyncio.Lock, type, types.FunctionType, types.MethodType, types.ModuleType,
+    )):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(key, seen) + approximate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+def int_query(request, name, default):
+    try:
+        return int(request.query.get(name, default))
+    except ValueError as err:
+        raise web.HTTPBadRequest(text=f"{name} must be an integer") from err
+
+async def get_caches(_):
+    """
+    Report sizes of operator caches and Bitwarden snapshots, never their values.
+    """
+    configs = []
+    for config in BitwardenSyncConfig.cache.values():
+        snapshot = config.bitwarden_secrets
+        configs.append({
+            "name": config.name,
+            "namespace": config.namespace,
+            "secrets": len(config.spec.get('secrets', [])),
+            "snapshotBytes": approximate_size(snapshot) if snapshot else 0,
+            "snapshotSecrets": len(snapshot.secrets) if snapshot else 0,
+            "statusEntries": len(config.sync_status_entries or {}),
+        })
+    return web.json_response({
+        "bitwardenSyncConfigs": {
+            "bytes": approximate_size(BitwardenSyncConfig.cache),
+            "count": len(BitwardenSyncConfig.cache),
+            "items": configs,
+        },
+        "bitwardenSyncSecrets": {
+            "bytes": approximate_size(BitwardenSyncSecret.cache),
+            "count": len(BitwardenSyncSecret.cache),
+        },
+        "dependencyIndex": {
+            "bytes": approximate_size(BitwardenSyncIndex.refs),
+            "refs": len(BitwardenSyncIndex.refs),
+        },
+        "keyMaps": {
+            "bytes": approximate_size(BitwardenSecrets.key_maps),
+            "count": len(BitwardenSecrets.key_maps),
+        },
+        "renderCache": BitwardenSecrets.render_cache.stats(),
+        "snapshotCache": {
+            "bytes": approximate_size(BitwardenSnapshotCache.snapshots),
+            "tokens": len(BitwardenSnapshotCache.snapshots),
+        },
+    })
+
+async def get_decode_pool(_):
+    """
+    Report snapshot decode durations and how long they blocked the event loop.
+    """
+    return web.json_response(BitwardenDecodePool.stats())
+
+async def get_dependencies(request):
+    """
+    List Kubernetes Secrets fed by a Bitwarden secret key.
+    """
+    key = request.query.get('key')
+    if not key:
+        raise web.HTTPBadRequest(text="key query parameter is required")
+    return web.json_response({
+        "key": key,
+        "project": request.query.get('project'),
+        "targets": BitwardenSyncIndex.query(key=key, project=request.query.get('project')),
+    })
+
+async def get_diffbase(_):
+    """
+    Report stored diffbase size and bytes saved by DIFFBASE_MODE.
+    """
+    return web.json_response(DiffBaseCodec.stats())
+
+async def get_k8s_pools(_):
+    """
+    Report Kubernetes API connection pool usage.
+    """
+    return web.json_response(K8sUtil.pool_stats())
+
+async def get_loop_lag(_):
+    """
+    Report event loop lag.
+    """
+    return web.json_response(LoopLagMonitor.stats())
+
+async def get_profile(_):
+    """
+    Return profiles of recently profiled syncs.
+    """
+    return web.json_response(SyncProfiler.status())
+
+async def post_profile(request):
+    """
+    Profile the next syncs, `syncs` query parameter sets how many.
+    """
+    SyncProfiler.request(int_query(request, 'syncs', 1))
+    return web.json_response(SyncProfiler.status())
+
+async def delete_tracemalloc(_):
+    """
+    Stop tracing memory allocations.
+    """
+    MemoryProfiler.stop()
+    return web.json_response({"tracing": False})
+
+async def get_tracemalloc(request):
+    """
+    Take memory snapshot, reporting top allocators and growth since the last snapshot.
+    """
+    return web.json_response(MemoryProfiler.snapshot(limit=int_query(request, 'limit', 20)))
+
+async def post_tracemalloc(request):
+    """
+    Start tracing memory allocations.
+    """
+    MemoryProfiler.start(frames=int_query(request, 'frames', 10))
+    return web.json_response({"tracing": True})
+
+async def get_render_cache(_):
+    """
+    Report rendered value cache statistics.
+    """
+    return web.json_response(BitwardenSecrets.render_cache.stats())
+
+def authorized(handler):
+    """
+    Wrap handler to check debug authorization before handling request.
+    """
+    async def authorized_handler(request):
+        HttpServer.check_debug_authorization(request)
+        return await handler(request)
+    return authorized_handler
+
+def register_debug_endpoints():
+    """
+    Register debug routes with the HTTP server.
+    """
+    HttpServer.add_route('GET', '/debug/caches', authorized(get_caches))
+    HttpServer.add_route('GET', '/debug/decode-pool', authorized(get_decode_pool))
+    HttpServer.add_route('GET', '/debug/dependencies', authorized(get_dependencies))
+    HttpServer.add_route('GET', '/debug/diffbase', authorized(get_diffbase))
+    HttpServer.add_route('GET', '/debug/k8s-pools', authorized(get_k8s_pools))
+    HttpServer.add_route('GET', '/debug/loop-lag', authorized(get_loop_lag))
+    HttpServer.add_route('GET', '/debug/profile', authorized(get_profile))
+    HttpServer.add_route('POST', '/debug/profile', authorized(post_profile))
+    HttpServer.add_route('GET', '/debug/render-cache', authorized(get_render_cache))
+    HttpServer.add_route('DELETE', '/debug/tracemalloc', authorized(delete_tracemalloc))
+    HttpServer.add_route('GET', '/debug/tracemalloc', authorized(get_tracemalloc))
+    HttpServer.add_route('POST', '/debug/tracemalloc', authorized(post_tracemalloc))
@@ -0,0 +1,101 @@
+from base64 import b64decode, b64encode
+from hashlib import sha256
+
+import json
+import os
+import zlib
+
+class DiffBaseCodec:
+    """
+    Encoding of the last handled configuration stored by kopf.
+
+    Modes:
+      full - JSON as stored by kopf
+      compressed - zlib compressed JSON, stored as a hash if larger than max_bytes
+      hash - SHA-256 of the configuration, which detects changes but not what changed
+
+    Any encoding can be decoded regardless of mode so that the mode may be changed.
+    """
+    mode = os.environ.get('DIFFBASE_MODE', 'full')
+    # Compressed configurations larger than this are stored as a hash
+    max_bytes = int(os.environ.get('DIFFBASE_MAX_BYTES', 16384))
+
+    compressed_prefix = 'z:'
+    hash_prefix = 'sha256:'
+
+    # Bytes stored and bytes full JSON would have stored, for all writes and by object
+    full_bytes = 0
+    stored_bytes = 0
+    stores = 0
+    objects = {}
+
+    @staticmethod
+    def dumps(essence):
+        return json.dumps(essence, separators=(',', ':'))
+
+    @classmethod
+    def digest(cls, essence):
+        return cls.hash_prefix + sha256(
+            json.dumps(essence, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    @classmethod
+    def decode(cls, encoded, essence=None):
+        """
+        Return stored configuration, comparing a stored hash to current essence.
+
+        A hash which does not match returns an empty configuration so that a
+        change is detected without details of the previous configuration.
+        """
+        if encoded is None:
+            return None
+        if encoded.startswith(cls.hash_prefix):
+            return essence if encoded == cls.digest(essence) else {}
+        if encoded.startswith(cls.compressed_prefix):
+            return json.loads(zlib.decompress(b64decode(encoded[len(cls.compressed_prefix):])))
+        return json.loads(encoded)
+
+    @classmethod
+    def encode(cls, essence):
+        if cls.mode == 'hash':
+            return cls.digest(essence)
+        full = cls.dumps(essence) + '\n'
+        if cls.mode == 'compressed':
+            encoded = cls.compressed_prefix + b64encode(
+                zlib.compress(full.encode('utf-8'), 9)
+            ).decode('ascii')
+            if len(encoded) > cls.max_bytes:
+                return cls.digest(essence)
+            return encoded
+        return full
+
+    @classmethod
+    def record(cls, uid, essence, encoded):
+        """
+        Record size of stored configuration against full JSON.
+        """
+        full_bytes = len((cls.dumps(essence) + '\n').encode('utf-8'))
+        stored_bytes = len(encoded.encode('utf-8'))
+        cls.full_bytes += full_bytes
+        cls.stored_bytes += stored_bytes
+        cls.stores += 1
+        if uid:
+            cls.objects[uid] = (full_bytes, stored_bytes)
+
+    @classmethod
+    def remove(cls, uid):
+        cls.objects.pop(uid, None)
+
+    @classmethod
+    def stats(cls):
+        object_full_bytes = sum(full_bytes for full_bytes, _ in cls.objects.values())
+        object_stored_bytes = sum(stored_bytes for _, stored_bytes in cls.objects.values())
+        return {
+            "mode": cls.mode,
+            "objects": len(cls.objects),
+            "objectBytes": object_stored_bytes,
+            "objectBytesSaved": object_full_bytes - object_stored_bytes,
+            "patchBytes": cls.stored_bytes,
+            "patchBytesSaved": cls.full_bytes - cls.stored_bytes,
+            "stores": cls.stores,
+        }
@@ -0,0 +1,125 @@
+"""
+Event-driven repair of managed Secrets changed or deleted outside of the operator.
+"""
+
+from collections import deque
+from time import time
+
+import asyncio
+import os
+
+class DriftRepair:
+    """
+    Debounced repair of managed Secrets from cached Bitwarden snapshots.
+
+    Operator writes and deletes are only recorded while enabled, as entries are
+    removed by the Secret watch events which are otherwise never received.
+    """
+
+    # Seconds to wait for further events before repairing
+    delay = float(os.environ.get('DRIFT_REPAIR_DELAY', 0.5))
+    # Off by default as kopf filters the Secret watch by label after listing every Secret
+    enabled = os.environ.get('DRIFT_REPAIR', 'false').lower() == 'true'
+    # Maximum repairs of one Secret within window seconds, to stop fights with other controllers
+    limit = int(os.environ.get('DRIFT_REPAIR_LIMIT', 5))
+    window = int(os.environ.get('DRIFT_REPAIR_WINDOW', 300))
+    pending = {}
+    # Times of recent repairs by Secret (namespace, name)
+    repairs = {}
+    # Resource versions of managed Secrets as last written or verified by the operator
+    operator_resource_versions = {}
+    # Managed Secrets deleted by the operator for which a watch event is expected
+    operator_deletes = set()
+
+    @classmethod
+    def discard_delete(cls, name, namespace):
+        cls.operator_deletes.discard((namespace, name))
+
+    @classmethod
+    def is_operator_change(cls, event_type, name, namespace, resource_version):
+        """
+        Check whether a Secret watch event reflects a change made by the operator.
+        """
+        if event_type == 'DELETED':
+            cls.operator_resource_versions.pop((namespace, name), None)
+            if (namespace, name) in cls.operator_deletes:
+                cls.operator_deletes.discard((namespace, name))
+                return True
+            return False
+        return cls.operator_resource_versions.get((namespace, name)) == resource_version
+
+    @classmethod
+    def record_delete(cls, name, namespace):
+        if cls.enabled:
+            cls.operator_deletes.add((namespace, name))
+
+    @classmethod
+    def record_write(cls, secret):
+        if cls.enabled:
+            cls.operator_resource_versions[(secret.metadata.namespace, secret.metadata.name)] = \
+                secret.metadata.resource_version
+
+    @classmethod
+    def on_event(cls, event_type, logger, name, namespace, owner, resource_version):
+        """
+        Handle managed Secret watch event.
+        """
+        # Initial listing is covered by syncs on resume.
+        if event_type is None:
+            return
+        if cls.is_operator_change(
+            event_type=event_type,
+            name=name,
+            namespace=namespace,
+            resource_version=resource_version,
+        ):
+            return
+        key = (namespace, name)
+        if owner is None or key in cls.pending:
+            return
+        cls.pending[key] = asyncio.create_task(cls.repair(
+            logger=logger,
+            name=name,
+            namespace=namespace,
+            owner=owner,
+        ))
+
+    @classmethod
+    def prune(cls, now):
+        """
+        Drop repair times outside the window and forget Secrets without recent repairs.
+        """
+        for key, history in list(cls.repairs.items()):
+            while history and history[0] < now - cls.window:
+                history.popleft()
+            if not history:
+                del cls.repairs[key]
+
+    @classmethod
+    async def repair(cls, logger, name, namespace, owner):
+        key = (namespace, name)
+        try:
+            await asyncio.sleep(cls.delay)
+        finally:
+            cls.pending.pop(key, None)
+
+        # Owner may have been deleted while waiting
+        if owner.cache.get((owner.namespace, owner.name)) is not owner:
+            return
+
+        now = time()
+        cls.prune(now)
+        history = cls.repairs.setdefault(key, deque())
+        if len(history) >= cls.limit:
+            logger.warning(
+                f"Not repairing Secret {name} in {namespace}: repaired {len(history)} times "
+                f"in {cls.window} seconds, leaving it for the next sync"
+            )
+            return
+        history.append(now)
+
+        try:
+            await owner.repair_secret(name=name, namespace=namespace, logger=logger)
+        # pylint: disable-next=broad-except
+        except Exception:
+            logger.exception(f"Error repairing Secret {name} in {namespace} for {owner}")
@@ -0,0 +1,98 @@
+"""
+Optional HTTP server for operator debug and control endpoints.
+"""
+
+import hmac
+import ipaddress
+import logging
+import os
+
+from aiohttp import web
+
+logger = logging.getLogger('http-server')
+
+class HttpServer:
+    """
+    Global aiohttp server, started only when a port is configured and routes are registered.
+    """
+
+    debug = os.environ.get('DEBUG_ENDPOINTS', 'false').lower() == 'true'
+    host = os.environ.get('HTTP_HOST', '0.0.0.0')
+    port = int(os.environ.get('HTTP_PORT', 8090))
+    routes = []
+    runner = None
+
+    @classmethod
+    def get_api_token(cls):
+        """
+        Return API token, read from SYNC_API_TOKEN_FILE on each call so that it may be rotated.
+        """
+        token_file = os.environ.get('SYNC_API_TOKEN_FILE')
+        if token_file:
+            try:
+                with open(token_file, encoding='utf-8') as file:
+                    return file.read().strip()
+            except OSError as err:
+                logger.warning(f"Unable to read SYNC_API_TOKEN_FILE: {err}")
+                return None
+        return os.environ.get('SYNC_API_TOKEN')
+
+    @classmethod
+    def check_authorization(cls, request):
+        """
+        Require API token as `Authorization: Bearer <token>`.
+        """
+        api_token = cls.get_api_token()
+        if not api_token:
+            # Never compare against an empty token
+            raise web.HTTPServiceUnavailable(text="API token is not available")
+        authorization = request.headers.get('Authorization', '')
+        if not authorization.startswith('Bearer ') or not hmac.compare_digest(
+            authorization[7:].encode('utf-8'), api_token.encode('utf-8')
+        ):
+            raise web.HTTPUnauthorized(text="Invalid or missing bearer token")
+
+    @classmethod
+    def check_debug_authorization(cls, request):
+        """
+        Require API token if configured, otherwise only accept requests from loopback addresses.
+        """
+        if os.environ.get('SYNC_API_TOKEN_FILE') or os.environ.get('SYNC_API_TOKEN'):
+            cls.check_authorization(request)
+            return
+        try:
+            if ipaddress.ip_address(request.remote or '').is_loopback:
+                return
+        except ValueError:
+            pass
+        raise web.HTTPForbidden(text="Debug endpoints require SYNC_API_TOKEN for remote access")
+
+    @classmethod
+    def add_route(cls, method, path, handler):
+        """
+        Register route to be served once the server is started.
+        """
+        cls.routes.append(web.route(method, path, handler))
+
+    @classmethod
+    async def on_startup(cls):
+        """
+        Start HTTP server if any routes are registered.
+        """
+        if not cls.routes or not cls.port:
+            return
+        app = web.Application()
+        app.add_routes(cls.routes)
+        cls.runner = web.AppRunner(app)
+        await cls.runner.setup()
+        site = web.TCPSite(cls.runner, cls.host, cls.port)
+        await site.start()
+
+    @classmethod
+    async def on_cleanup(cls):
+        """
+        Stop HTTP server.
+        """
+        if cls.runner:
+            await cls.runner.cleanup()
+            cls.runner = None
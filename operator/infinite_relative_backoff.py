@@ -2,17 +2,22 @@
 Implementation of infinite backoff for Kopf
 """
 
+import random
+
 class InfiniteRelativeBackoff:
     """
     Infinite backoff logic with configurable maximum retry period.
     """
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, initial_delay=0.1, scaling_factor=2, maximum=60):
+    def __init__(self, initial_delay=0.1, scaling_factor=2, maximum=60, jitter=0):
         """
         Initialize with defaults.
+
+        Jitter is a fraction by which each delay is randomly varied up or down.
         """
         self.initial_delay = initial_delay
+        self.jitter = jitter
         self.scaling_factor = scaling_factor
         self.maximum = maximum
 
@@ -23,7 +28,15 @@ class InfiniteRelativeBackoff:
         delay = self.initial_delay
         while True:
             if delay > self.maximum:
-                yield self.maximum
+                yield self.__apply_jitter(self.maximum)
             else:
-                yield delay
+                yield self.__apply_jitter(delay)
                 delay *= self.scaling_factor
+
+    def __apply_jitter(self, delay):
+        """
+        Randomly vary delay to avoid synchronized retries.
+        """
+        if not self.jitter:
+            return delay
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
@@ -0,0 +1,44 @@
+"""
+Cache of namespaces and their labels, kept current from a namespace watch.
+"""
+
+from k8sutil import K8sUtil
+
+class K8sNamespaces:
+    """
+    Global namespace cache.
+    """
+
+    cache = {}
+    loaded = False
+
+    @classmethod
+    async def on_startup(cls):
+        """
+        Populate cache before watches of namespaced resources start.
+        """
+        namespace_list = await K8sUtil.core_v1_api.list_namespace()
+        for namespace in namespace_list.items:
+            cls.cache[namespace.metadata.name] = namespace.metadata.labels or {}
+        cls.loaded = True
+
+    @classmethod
+    def on_event(cls, event_type, name, labels):
+        """
+        Update cache from namespace watch event.
+        """
+        if event_type == 'DELETED':
+            cls.cache.pop(name, None)
+        else:
+            cls.cache[name] = dict(labels or {})
+
+    @classmethod
+    def exists(cls, name):
+        """
+        Return whether namespace exists, assuming it does until the cache is loaded.
+        """
+        return not cls.loaded or name in cls.cache
+
+    @classmethod
+    def get_labels(cls, name):
+        return cls.cache.get(name)
@@ -0,0 +1,54 @@
+from time import monotonic
+
+class K8sPoolStats:
+    """
+    Usage of a Kubernetes API client connection pool.
+
+    Requests wait in queue when all connections of the pool are in use, which
+    indicates that the pool is saturated.
+    """
+
+    def __init__(self, name, maxsize):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.maxsize = maxsize
+        self.name = name
+        self.queue_wait_max = 0.0
+        self.queue_wait_total = 0.0
+        self.queued = 0
+        self.requests = 0
+
+    def request_start(self):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def request_end(self):
+        self.in_flight -= 1
+
+    @staticmethod
+    def queue_start():
+        return monotonic()
+
+    def queue_end(self, started):
+        """
+        Record wait for a pooled connection, returning wait in seconds.
+        """
+        wait = monotonic() - started
+        self.queued += 1
+        self.queue_wait_max = max(self.queue_wait_max, wait)
+        self.queue_wait_total += wait
+        return wait
+
+    def stats(self):
+        return {
+            "inFlight": self.in_flight,
+            "maxInFlight": self.max_in_flight,
+            "maxsize": self.maxsize,
+            "name": self.name,
+            "queueWaitMax": round(self.queue_wait_max, 3),
+            "queueWaitTotal": round(self.queue_wait_total, 3),
+            "queued": self.queued,
+            "queuedRatio": round(self.queued / self.requests, 3) if self.requests else 0,
+            "requests": self.requests,
+        }
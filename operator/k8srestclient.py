@@ -0,0 +1,102 @@
+import logging
+import ssl
+
+import aiohttp
+import kubernetes_asyncio
+
+from k8spoolstats import K8sPoolStats
+
+logger = logging.getLogger('k8s-client')
+
+class K8sRESTClient(kubernetes_asyncio.client.rest.RESTClientObject):
+    """
+    Kubernetes REST client with configurable connection pool, keepalive, and
+    default request timeouts, recording connection pool usage.
+    """
+
+    def __init__(self, configuration, name, request_timeout, connect_timeout, queue_warning):
+        # pylint: disable=too-many-arguments
+        super().__init__(configuration)
+        self.pool_stats = K8sPoolStats(name=name, maxsize=configuration.connection_pool_maxsize)
+        self.queue_warning = queue_warning
+        # Connect timeout excludes waiting for a pooled connection
+        self.request_timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout,
+            total=request_timeout,
+        )
+
+    @classmethod
+    async def create(cls, configuration, name, keepalive_timeout, request_timeout, connect_timeout,
+                     queue_warning):
+        """
+        Create client, replacing the session of RESTClientObject, which does not
+        accept connector settings, with a tuned and traced session.
+        """
+        # pylint: disable=too-many-arguments
+        client = cls(
+            configuration,
+            connect_timeout=connect_timeout,
+            name=name,
+            queue_warning=queue_warning,
+            request_timeout=request_timeout,
+        )
+        await client.pool_manager.close()
+        client.pool_manager = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                keepalive_timeout=keepalive_timeout,
+                limit=configuration.connection_pool_maxsize,
+                ssl=cls.build_ssl_context(configuration),
+            ),
+            read_bufsize=2**21,
+            trace_configs=[client.build_trace_config()],
+            trust_env=True,
+        )
+        return client
+
+    @staticmethod
+    def build_ssl_context(configuration):
+        """
+        SSL context as configured for RESTClientObject, which does not expose its own.
+        """
+        ssl_context = ssl.create_default_context(cafile=configuration.ssl_ca_cert)
+        if configuration.cert_file:
+            ssl_context.load_cert_chain(configuration.cert_file, keyfile=configuration.key_file)
+        if not configuration.verify_ssl:
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        if getattr(configuration, 'disable_strict_ssl_verification', False):
+            ssl_context.verify_flags &= ~ssl.VERIFY_X509_STRICT
+        return ssl_context
+
+    def build_trace_config(self):
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(_session, context, _params):
+            context.queue_started = None
+            self.pool_stats.request_start()
+
+        async def on_request_end(_session, _context, _params):
+            self.pool_stats.request_end()
+
+        async def on_connection_queued_start(_session, context, _params):
+            context.queue_started = self.pool_stats.queue_start()
+
+        async def on_connection_queued_end(_session, context, _params):
+            wait = self.pool_stats.queue_end(context.queue_started)
+            if wait >= self.queue_warning:
+                logger.warning(
+                    f"Kubernetes {self.pool_stats.name} client waited {wait:.3f}s for connection, "
+                    f"{self.pool_stats.in_flight} of {self.pool_stats.maxsize} in use"
+                )
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_end)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        return trace_config
+
+    async def request(self, *args, _request_timeout=None, **kwargs):
+        return await super().request(
+            *args, _request_timeout=_request_timeout or self.request_timeout, **kwargs
+        )
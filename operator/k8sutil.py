@@ -8,6 +8,9 @@ import os
 
 import kubernetes_asyncio
 
+from diffbasecodec import DiffBaseCodec
+from k8srestclient import K8sRESTClient
+
 class K8sUtil:
     """
     Global class for accessing API and processed environment settings
@@ -19,6 +22,16 @@ class K8sUtil:
     operator_namespace = None
     operator_version = os.environ.get('OPERATOR_VERSION', 'v1')
     sync_config_label = os.environ.get('MANAGED_SECRET_LABEL', f"{operator_domain}/config")
+    # Changing the value of this annotation requests an immediate sync
+    sync_request_annotation = f"{operator_domain}/sync-request"
+
+    # Kubernetes API connection pool settings, status writes use a separate pool
+    connect_timeout = float(os.environ.get('K8S_CONNECT_TIMEOUT', 10))
+    keepalive_timeout = float(os.environ.get('K8S_KEEPALIVE_TIMEOUT', 30))
+    pool_maxsize = int(os.environ.get('K8S_POOL_MAXSIZE', 32))
+    pool_queue_warning = float(os.environ.get('K8S_POOL_QUEUE_WARNING', 1))
+    request_timeout = float(os.environ.get('K8S_REQUEST_TIMEOUT', 60))
+    status_pool_maxsize = int(os.environ.get('K8S_STATUS_POOL_MAXSIZE', 8))
 
     @classmethod
     async def on_startup(cls):
@@ -33,9 +46,35 @@ class K8sUtil:
             await kubernetes_asyncio.config.load_kube_config()
             cls.operator_namespace = os.environ.get('OPERATOR_NAMSEPACE', None)
 
-        cls.api_client = kubernetes_asyncio.client.ApiClient()
+        cls.api_client = await cls.build_api_client(name='default', pool_maxsize=cls.pool_maxsize)
         cls.core_v1_api = kubernetes_asyncio.client.CoreV1Api(cls.api_client)
         cls.custom_objects_api = kubernetes_asyncio.client.CustomObjectsApi(cls.api_client)
+        # Status patches do not compete with Secret writes for connections
+        cls.status_api_client = await cls.build_api_client(name='status', pool_maxsize=cls.status_pool_maxsize)
+        cls.status_custom_objects_api = kubernetes_asyncio.client.CustomObjectsApi(cls.status_api_client)
+
+    @classmethod
+    async def build_api_client(cls, name, pool_maxsize):
+        configuration = kubernetes_asyncio.client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = pool_maxsize
+        api_client = kubernetes_asyncio.client.ApiClient(configuration)
+        await api_client.rest_client.close()
+        api_client.rest_client = await K8sRESTClient.create(
+            configuration,
+            connect_timeout=cls.connect_timeout,
+            keepalive_timeout=cls.keepalive_timeout,
+            name=name,
+            queue_warning=cls.pool_queue_warning,
+            request_timeout=cls.request_timeout,
+        )
+        return api_client
+
+    @classmethod
+    def pool_stats(cls):
+        return [
+            api_client.rest_client.pool_stats.stats()
+            for api_client in (cls.api_client, cls.status_api_client)
+        ]
 
     @classmethod
     async def on_cleanup(cls):
@@ -43,6 +82,7 @@ class K8sUtil:
         Gracefully shutdown on cleanup
         """
         await cls.api_client.close()
+        await cls.status_api_client.close()
 
 class K8sObject:
     """
@@ -70,6 +110,13 @@ class K8sObject:
         """
         return f"{self.kind} {self.name} in {self.namespace}"
 
+    @property
+    def generation(self):
+        """
+        Object metadata.generation, which changes only when the spec changes.
+        """
+        return self.meta.get('generation')
+
     def refresh_from_definition(self, definition):
         """
         Update from object definition as returned by kubernetes api
@@ -116,7 +163,7 @@ class K8sObject:
         """
         Apply JSON merge patch to object status.
         """
-        definition = await K8sUtil.custom_objects_api.patch_namespaced_custom_object_status(
+        definition = await K8sUtil.status_custom_objects_api.patch_namespaced_custom_object_status(
             group = self.api_group,
             name = self.name,
             namespace = self.namespace,
@@ -140,6 +187,17 @@ class CachedK8sObject(K8sObject):
         """
         super().__init__(**kwargs)
         self.lock = asyncio.Lock()
+        self.compiled_cache = {}
+
+    @classmethod
+    def get_by_uid(cls, uid):
+        """
+        Return cached object with uid, if any.
+        """
+        for obj in cls.cache.values():
+            if obj.uid == uid:
+                return obj
+        return None
 
     @classmethod
     def register(cls, annotations, labels, meta, name, namespace, spec, status, uid, **_):
@@ -167,8 +225,21 @@ class CachedK8sObject(K8sObject):
             cls.cache[(namespace, name)] = obj
         return obj
 
+    def compiled(self, name, compile_spec):
+        """
+        Return value compiled from spec, reusing it until metadata.generation changes.
+        """
+        generation = self.generation
+        cached = self.compiled_cache.get(name)
+        if cached and generation is not None and cached[0] == generation:
+            return cached[1]
+        value = compile_spec()
+        self.compiled_cache[name] = (generation, value)
+        return value
+
     def unregister(self):
         """
         Remove object from cache.
         """
         self.cache.pop((self.namespace, self.name), None)
+        DiffBaseCodec.remove(self.uid)
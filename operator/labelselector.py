@@ -0,0 +1,84 @@
+import re
+
+class LabelSelector:
+    """
+    Kubernetes label selector, parsed from string syntax or a LabelSelector object.
+    """
+    # pylint: disable=too-few-public-methods
+
+    requirement_re = re.compile(
+        r'^\s*(?:(?P<absent>!)\s*(?P<absent_key>[^\s!=,()]+)'
+        r'|(?P<key>[^\s!=,()]+)\s*(?:(?P<op>==|!=|=)\s*(?P<value>[^\s!=,()]*)'
+        r'|\s+(?P<set_op>in|notin)\s+\((?P<values>[^)]*)\))?)\s*$'
+    )
+
+    @classmethod
+    def from_dict(cls, definition):
+        """
+        Build from LabelSelector object with matchLabels and matchExpressions.
+        """
+        requirements = [
+            (key, 'In', (value,))
+            for key, value in (definition.get('matchLabels') or {}).items()
+        ]
+        for expression in definition.get('matchExpressions') or []:
+            requirements.append((
+                expression['key'], expression['operator'], tuple(expression.get('values') or ()),
+            ))
+        return cls(requirements)
+
+    @classmethod
+    def parse(cls, selector):
+        """
+        Parse label selector string such as `tier=prod,team in (a,b),!legacy`.
+        """
+        requirements = []
+        # Split on commas which are not within parenthesized value sets
+        for requirement in re.split(r',(?![^(]*\))', selector or ''):
+            if not requirement.strip():
+                continue
+            match = cls.requirement_re.match(requirement)
+            if not match:
+                raise ValueError(f"Invalid label selector requirement: {requirement}")
+            if match.group('absent'):
+                requirements.append((match.group('absent_key'), 'DoesNotExist', ()))
+            elif match.group('op'):
+                requirements.append((
+                    match.group('key'),
+                    'NotIn' if match.group('op') == '!=' else 'In',
+                    (match.group('value'),),
+                ))
+            elif match.group('set_op'):
+                requirements.append((
+                    match.group('key'),
+                    'In' if match.group('set_op') == 'in' else 'NotIn',
+                    tuple(value.strip() for value in match.group('values').split(',')),
+                ))
+            else:
+                requirements.append((match.group('key'), 'Exists', ()))
+        return cls(requirements)
+
+    def __init__(self, requirements):
+        self.requirements = requirements
+
+    def __bool__(self):
+        return bool(self.requirements)
+
+    def matches(self, labels):
+        labels = labels or {}
+        for key, operator, values in self.requirements:
+            if operator == 'In':
+                if labels.get(key) not in values:
+                    return False
+            elif operator == 'NotIn':
+                if key in labels and labels[key] in values:
+                    return False
+            elif operator == 'Exists':
+                if key not in labels:
+                    return False
+            elif operator == 'DoesNotExist':
+                if key in labels:
+                    return False
+            else:
+                raise ValueError(f"Invalid label selector operator: {operator}")
+        return True
@@ -0,0 +1,55 @@
+from collections import deque
+from time import monotonic
+
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger('loop-lag')
+
+class LoopLagMonitor:
+    """
+    Measure event loop lag as the delay of a periodic sleep beyond its interval.
+    """
+    interval = float(os.environ.get('LOOP_LAG_INTERVAL', 0.5))
+    # Log a warning when the loop is blocked for at least this many seconds
+    warning = float(os.environ.get('LOOP_LAG_WARNING', 1))
+    samples = deque(maxlen=240)
+    task = None
+
+    @classmethod
+    def record(cls, lag):
+        cls.samples.append(lag)
+        if lag >= cls.warning:
+            logger.warning(f"Event loop blocked for {lag:.3f}s")
+
+    @classmethod
+    async def run(cls):
+        while True:
+            start = monotonic()
+            await asyncio.sleep(cls.interval)
+            cls.record(max(monotonic() - start - cls.interval, 0))
+
+    @classmethod
+    def stats(cls):
+        samples = sorted(cls.samples)
+        if not samples:
+            return {"samples": 0}
+        return {
+            "last": round(cls.samples[-1], 4),
+            "max": round(samples[-1], 4),
+            "mean": round(sum(samples) / len(samples), 4),
+            "p99": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 4),
+            "samples": len(samples),
+        }
+
+    @classmethod
+    async def on_startup(cls):
+        cls.task = asyncio.create_task(cls.run())
+
+    @classmethod
+    async def on_cleanup(cls):
+        if cls.task:
+            cls.task.cancel()
+            await asyncio.gather(cls.task, return_exceptions=True)
+            cls.task = None
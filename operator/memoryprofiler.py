@@ -0,0 +1,54 @@
+import tracemalloc
+
+class MemoryProfiler:
+    """
+    tracemalloc snapshots reporting top allocators and growth since the previous snapshot.
+    """
+    previous = None
+
+    @classmethod
+    def start(cls, frames=10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        cls.previous = None
+
+    @classmethod
+    def stop(cls):
+        tracemalloc.stop()
+        cls.previous = None
+
+    @staticmethod
+    def format_stat(stat):
+        frame = stat.traceback[0]
+        return {
+            "count": stat.count,
+            "countDiff": getattr(stat, 'count_diff', None),
+            "location": f"{frame.filename}:{frame.lineno}",
+            "size": stat.size,
+            "sizeDiff": getattr(stat, 'size_diff', None),
+        }
+
+    @classmethod
+    def snapshot(cls, limit=20):
+        """
+        Return top allocations by source line, with growth since the previous snapshot.
+        """
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        result = {
+            "current": current,
+            "peak": peak,
+            "top": [cls.format_stat(stat) for stat in snapshot.statistics('lineno')[:limit]],
+            "tracing": True,
+        }
+        if cls.previous:
+            result['growth'] = [
+                cls.format_stat(stat) for stat in snapshot.compare_to(cls.previous, 'lineno')[:limit]
+            ]
+        cls.previous = snapshot
+        return result
@@ -9,11 +9,22 @@ from time import time
 
 import kopf
 
+from compactdiffbasestorage import CompactDiffBaseStorage
 from configure_kopf_logging import configure_kopf_logging
 from infinite_relative_backoff import InfiniteRelativeBackoff
+from bitwardendecodepool import BitwardenDecodePool
+from bitwardensnapshotcache import BitwardenSnapshotCache
 from bitwardensyncconfig import BitwardenSyncConfig
 from bitwardensyncsecret import BitwardenSyncSecret
+from debugendpoints import register_debug_endpoints
+from driftrepair import DriftRepair
+from httpserver import HttpServer
+from k8snamespaces import K8sNamespaces
 from k8sutil import K8sUtil
+from looplagmonitor import LoopLagMonitor
+from syncadmissionqueue import SyncAdmissionQueue
+from syncendpoints import register_sync_endpoints
+from webhookendpoints import register_webhook_endpoints
 
 @kopf.on.startup()
 async def startup(settings: kopf.OperatorSettings, **_):
@@ -23,8 +34,8 @@ async def startup(settings: kopf.OperatorSettings, **_):
     # Never give up from network errors
     settings.networking.error_backoffs = InfiniteRelativeBackoff()
 
-    # Store last handled configuration in status
-    settings.persistence.diffbase_storage = kopf.StatusDiffBaseStorage(field='status.diffBase')
+    # Store last handled configuration in status, compacted according to DIFFBASE_MODE
+    settings.persistence.diffbase_storage = CompactDiffBaseStorage(field='status.diffBase')
 
     # Use operator domain as finalizer
     settings.persistence.finalizer = K8sUtil.operator_domain
@@ -42,14 +53,54 @@ async def startup(settings: kopf.OperatorSettings, **_):
     configure_kopf_logging()
 
     await K8sUtil.on_startup()
+    await K8sNamespaces.on_startup()
+    await BitwardenDecodePool.on_startup()
+    await BitwardenSnapshotCache.on_startup()
+    await SyncAdmissionQueue.on_startup()
+
+    if HttpServer.debug:
+        register_debug_endpoints()
+        await LoopLagMonitor.on_startup()
+    register_sync_endpoints()
+    register_webhook_endpoints()
+    await HttpServer.on_startup()
 
 @kopf.on.cleanup()
 async def cleanup(**_):
     """
     Gracefully shutdown on cleanup
     """
+    await HttpServer.on_cleanup()
+    await LoopLagMonitor.on_cleanup()
+    await SyncAdmissionQueue.on_cleanup()
+    await BitwardenSnapshotCache.on_cleanup()
+    await BitwardenDecodePool.on_cleanup()
     await K8sUtil.on_cleanup()
 
+@kopf.on.event('', 'v1', 'namespaces')
+async def namespace_event(event, labels, logger, name, **_):
+    """
+    Track namespaces and their labels
+    """
+    K8sNamespaces.on_event(event_type=event['type'], name=name, labels=labels)
+    BitwardenSyncConfig.on_namespace_event(event_type=event['type'], labels=labels, logger=logger, name=name)
+
+if DriftRepair.enabled:
+    @kopf.on.event('', 'v1', 'secrets', labels={K8sUtil.sync_config_label: kopf.PRESENT})
+    async def managed_secret_event(event, labels, logger, meta, name, namespace, **_):
+        """
+        Repair managed Secrets changed or deleted outside of the operator
+        """
+        owner_uid = labels.get(K8sUtil.sync_config_label)
+        DriftRepair.on_event(
+            event_type=event['type'],
+            logger=logger,
+            name=name,
+            namespace=namespace,
+            owner=BitwardenSyncConfig.get_by_uid(owner_uid) or BitwardenSyncSecret.get_by_uid(owner_uid),
+            resource_version=meta.get('resourceVersion'),
+        )
+
 @kopf.on.create(
     BitwardenSyncConfig.api_group, BitwardenSyncConfig.api_version, BitwardenSyncConfig.plural,
 )
@@ -95,13 +146,17 @@ async def bitwarden_sync_config_daemon(logger, stopped, **kwargs):
     BitwardenSyncConfig sync daemon
     """
     config = BitwardenSyncConfig.register(**kwargs)
-    last_sync = time()
     try:
         while not stopped:
             await asyncio.sleep(2)
-            if config.sync_pending or time() >= last_sync + config.sync_interval:
+            if SyncAdmissionQueue.is_pending((config.kind, config.namespace, config.name)):
+                continue
+            # Retry when backoff expires rather than at the next poll after it
+            if (
+                ((config.sync_pending or config.backoff_token_digest) and time() >= config.retry_after) or
+                time() >= config.last_sync + config.poll_interval
+            ):
                 await config.sync_secrets(logger=logger)
-                last_sync = time()
     except asyncio.CancelledError:
         pass
 
@@ -0,0 +1,100 @@
+"""
+Admission queue to throttle and prioritize syncs when the operator resumes.
+"""
+
+from itertools import count
+
+import asyncio
+import os
+
+class SyncAdmissionQueue:
+    """
+    Global priority queue of syncs run by a fixed number of workers.
+
+    Lower priority values run first. Delayed syncs enter the queue once their
+    delay has passed.
+    """
+
+    parallelism = int(os.environ.get('RESUME_SYNC_PARALLELISM', 4))
+    # Timer handles of delayed syncs by key
+    delayed = {}
+    # Sequence number of the queued item by key, items with another number were replaced or cancelled
+    pending = {}
+    queue = None
+    sequence = count()
+    workers = []
+
+    @classmethod
+    def is_pending(cls, key):
+        return key in cls.pending
+
+    @classmethod
+    async def on_startup(cls):
+        """
+        Start queue workers.
+        """
+        cls.queue = asyncio.PriorityQueue()
+        cls.workers = [
+            asyncio.create_task(cls.worker()) for _ in range(max(cls.parallelism, 1))
+        ]
+
+    @classmethod
+    async def on_cleanup(cls):
+        """
+        Stop queue workers and discard delayed syncs.
+        """
+        for key in list(cls.delayed):
+            cls.cancel(key)
+        for worker in cls.workers:
+            worker.cancel()
+        await asyncio.gather(*cls.workers, return_exceptions=True)
+        cls.workers = []
+
+    @classmethod
+    def cancel(cls, key):
+        """
+        Discard queued or delayed sync.
+        """
+        handle = cls.delayed.pop(key, None)
+        if handle:
+            handle.cancel()
+        cls.pending.pop(key, None)
+
+    @classmethod
+    def enqueue(cls, item):
+        cls.delayed.pop(item[2], None)
+        cls.queue.put_nowait(item)
+
+    @classmethod
+    def submit(cls, key, logger, priority, sync, delay=0):
+        """
+        Queue sync coroutine function, ignoring keys which are already queued.
+
+        A sync without delay replaces a delayed sync for the same key.
+        """
+        if key in cls.pending:
+            if delay > 0 or key not in cls.delayed:
+                return
+            cls.delayed.pop(key).cancel()
+        item = (priority, next(cls.sequence), key, sync, logger)
+        cls.pending[key] = item[1]
+        if delay > 0:
+            cls.delayed[key] = asyncio.get_running_loop().call_later(delay, cls.enqueue, item)
+        else:
+            cls.queue.put_nowait(item)
+
+    @classmethod
+    async def worker(cls):
+        while True:
+            _, sequence, key, sync, logger = await cls.queue.get()
+            try:
+                if cls.pending.get(key) != sequence:
+                    # Cancelled or replaced
+                    continue
+                del cls.pending[key]
+                await sync()
+            # pylint: disable-next=broad-except
+            except Exception:
+                logger.exception("Error in queued sync")
+            finally:
+                cls.queue.task_done()
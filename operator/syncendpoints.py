@@ -0,0 +1,101 @@
+"""
+Authenticated endpoints to request an immediate sync and wait for its result.
+
+Enabled when SYNC_API_TOKEN or SYNC_API_TOKEN_FILE is set. Requests must send
+the token as `Authorization: Bearer <token>`.
+"""
+
+from time import monotonic
+
+import logging
+
+from aiohttp import web
+
+from bitwardensyncconfig import BitwardenSyncConfig
+from bitwardensyncindex import BitwardenSyncTarget
+from bitwardensyncsecret import BitwardenSyncSecret
+from httpserver import HttpServer
+
+logger = logging.getLogger('sync-endpoints')
+
+def sync_response(synced, config, started, **kwargs):
+    """
+    JSON response with timing and backoff state when the sync did not run.
+    """
+    response = {
+        "duration": round(monotonic() - started, 3),
+        "synced": synced,
+        **kwargs,
+    }
+    if not synced:
+        response['backoff'] = (config.status or {}).get('backoff')
+    return web.json_response(response, status=200 if synced else 503)
+
+async def post_sync_config(request):
+    """
+    Sync BitwardenSyncConfig, or only Secrets affected by changes and one
+    target if `secretName` and optionally `secretNamespace` are given.
+    """
+    HttpServer.check_authorization(request)
+    namespace = request.match_info['namespace']
+    name = request.match_info['name']
+    config = BitwardenSyncConfig.cache.get((namespace, name))
+    if not config:
+        raise web.HTTPNotFound(text=f"BitwardenSyncConfig {name} in {namespace} not found")
+
+    secret_name = request.query.get('secretName')
+    started = monotonic()
+    if not secret_name:
+        config.sync_pending = True
+        synced = await config.sync_secrets(force=True, logger=logger)
+        summary = {}
+        for entry in (config.sync_status_entries or {}).values():
+            summary[entry['state']] = summary.get(entry['state'], 0) + 1
+        return sync_response(synced, config, started, summary=summary)
+
+    secret_namespace = request.query.get('secretNamespace', namespace)
+    synced = await config.sync_secrets(
+        force=True,
+        logger=logger,
+        sync_targets={
+            BitwardenSyncTarget(config.kind, namespace, name, secret_namespace, secret_name),
+        },
+    )
+    status_entry = config.get_status_entry(name=secret_name, namespace=secret_namespace)
+    if synced and not status_entry:
+        raise web.HTTPNotFound(
+            text=f"Secret {secret_name} in {secret_namespace} not configured in {config}"
+        )
+    return sync_response(synced, config, started, secret=status_entry)
+
+async def post_sync_secret(request):
+    """
+    Sync one BitwardenSyncSecret and Secrets affected by changes.
+    """
+    HttpServer.check_authorization(request)
+    namespace = request.match_info['namespace']
+    name = request.match_info['name']
+    secret = BitwardenSyncSecret.cache.get((namespace, name))
+    if not secret:
+        raise web.HTTPNotFound(text=f"BitwardenSyncSecret {name} in {namespace} not found")
+    config = BitwardenSyncConfig.cache.get((secret.config_namespace, secret.config_name))
+    if not config:
+        raise web.HTTPNotFound(
+            text=f"BitwardenSyncConfig {secret.config_name} in {secret.config_namespace} not found"
+        )
+
+    started = monotonic()
+    synced = await config.sync_secrets(force=True, logger=logger, sync_targets={secret.sync_target})
+    return sync_response(synced, config, started, secret={
+        "state": (secret.status or {}).get('state'),
+        "error": (secret.status or {}).get('error'),
+    })
+
+def register_sync_endpoints():
+    """
+    Register sync routes with the HTTP server if an API token is configured.
+    """
+    if not HttpServer.get_api_token():
+        return
+    HttpServer.add_route('POST', '/sync/bitwardensyncconfigs/{namespace}/{name}', post_sync_config)
+    HttpServer.add_route('POST', '/sync/bitwardensyncsecrets/{namespace}/{name}', post_sync_secret)
@@ -0,0 +1,54 @@
+from collections import deque
+from contextlib import contextmanager
+from time import monotonic
+
+import cProfile
+import io
+import pstats
+
+class SyncProfiler:
+    """
+    cProfile capture of the next requested number of syncs.
+
+    Other tasks running on the event loop during a profiled sync are included
+    in its profile.
+    """
+    remaining = 0
+    results = deque(maxlen=10)
+    active = False
+
+    @classmethod
+    def request(cls, count):
+        cls.remaining = max(count, 0)
+
+    @classmethod
+    @contextmanager
+    def profile(cls, name, limit=40):
+        # cProfile cannot profile overlapping syncs
+        if cls.remaining <= 0 or cls.active:
+            yield
+            return
+        cls.active = True
+        cls.remaining -= 1
+        profiler = cProfile.Profile()
+        start = monotonic()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            cls.active = False
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+            cls.results.append({
+                "duration": round(monotonic() - start, 3),
+                "name": name,
+                "stats": output.getvalue(),
+            })
+
+    @classmethod
+    def status(cls):
+        return {
+            "remaining": cls.remaining,
+            "results": list(cls.results),
+        }
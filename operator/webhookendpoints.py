@@ -0,0 +1,118 @@
+"""
+Receiver for Bitwarden change notifications, enabled with WEBHOOK_SECRET.
+
+Notifications queue syncs only for configs with targets that depend on the
+changed secrets. Polling continues at WEBHOOK_POLL_INTERVAL as a safety net.
+"""
+
+import logging
+
+from aiohttp import web
+
+from bitwardensyncconfig import BitwardenSyncConfig
+from bitwardensyncindex import BitwardenSyncIndex
+from bitwardensyncsecret import BitwardenSyncSecret
+from bitwardenwebhook import BitwardenWebhook
+from bitwardenwebhookerror import BitwardenWebhookError
+from httpserver import HttpServer
+
+logger = logging.getLogger('webhook')
+
+def resolve_refs(events):
+    """
+    Return (project name, key) references for change events and whether any
+    secret id was unknown.
+
+    Secret ids are resolved from the last Bitwarden snapshot of each config.
+    """
+    refs = set()
+    unknown = False
+    for event in events:
+        if event.key:
+            project = event.project
+            if not project and event.project_id:
+                for config in BitwardenSyncConfig.cache.values():
+                    if config.bitwarden_projects:
+                        bitwarden_project = config.bitwarden_projects.get_project_by_id(event.project_id)
+                        if bitwarden_project:
+                            project = bitwarden_project.name
+                            break
+            refs.add((project, event.key))
+            continue
+        resolved = False
+        for config in BitwardenSyncConfig.cache.values():
+            if config.bitwarden_secrets is None:
+                continue
+            secret = config.bitwarden_secrets.secrets_by_id.get(event.secret_id)
+            if secret:
+                project = config.bitwarden_projects.get_project_by_id(secret.project_id)
+                refs.add((project.name if project else None, secret.key))
+                resolved = True
+        unknown = unknown or not resolved
+    return refs, unknown
+
+def get_affected_configs(events):
+    """
+    Return configs with targets depending on changed secrets.
+
+    A secret unknown to every snapshot may be newly created, which only matters
+    to configs with targets that have not synced.
+    """
+    refs, unknown = resolve_refs(events)
+    configs = {}
+    for target in BitwardenSyncIndex.get_targets(refs):
+        if target.kind == BitwardenSyncSecret.kind:
+            secret = BitwardenSyncSecret.cache.get((target.namespace, target.name))
+            if not secret:
+                continue
+            config = BitwardenSyncConfig.cache.get((secret.config_namespace, secret.config_name))
+        else:
+            config = BitwardenSyncConfig.cache.get((target.namespace, target.name))
+        if config:
+            configs[(config.namespace, config.name)] = config
+    if unknown:
+        for config in BitwardenSyncConfig.cache.values():
+            if (
+                config.sync_status_entries is None or
+                any(entry.get('state') != 'synced' for entry in config.sync_status_entries.values()) or
+                BitwardenSyncSecret.any_unsynced_for_config(config=config)
+            ):
+                configs[(config.namespace, config.name)] = config
+    return list(configs.values())
+
+async def post_webhook(request):
+    """
+    Accept change notification and queue syncs of affected configs.
+    """
+    body = await request.read()
+    try:
+        BitwardenWebhook.verify(
+            body=body,
+            signature=request.headers.get('X-Webhook-Signature'),
+            timestamp=request.headers.get('X-Webhook-Timestamp'),
+        )
+    except BitwardenWebhookError as err:
+        raise web.HTTPUnauthorized(text=f"{err}")
+    try:
+        events = BitwardenWebhook.parse_events(body)
+    except BitwardenWebhookError as err:
+        raise web.HTTPBadRequest(text=f"{err}")
+
+    configs = get_affected_configs(events)
+    for config in configs:
+        config.queue_sync(logger=logger, priority=0)
+    logger.info(f"Change notification with {len(events)} events queued sync of {len(configs)} configs")
+    return web.json_response({
+        "configs": [
+            {"namespace": config.namespace, "name": config.name} for config in configs
+        ],
+        "events": len(events),
+    }, status=202)
+
+def register_webhook_endpoints():
+    """
+    Register change notification route with the HTTP server if a secret is configured.
+    """
+    if not BitwardenWebhook.enabled():
+        return
+    HttpServer.add_route('POST', '/webhook/bitwarden', post_webhook)
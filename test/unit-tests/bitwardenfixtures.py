@@ -0,0 +1,31 @@
+"""
+Bitwarden definitions shared by unit tests, in the format output by bws.
+"""
+
+project_id = "00000000-0000-0000-0000-000000000000"
+
+project_definitions = [{
+    "id": project_id,
+    "organizationId": "00000000-0000-0000-0000-000000000000",
+    "name": "project0",
+    "creationDate": "1970-01-01T00:00:00.000000000Z",
+    "revisionDate": "1970-01-01T00:00:00.000000000Z",
+}]
+
+def revision_date(day=1):
+    return f"1970-01-{day:02d}T00:00:00.000000000Z"
+
+def secret_definition(key, value="value", index=1, day=1):
+    """
+    Secret definition with id from index and revision date from day.
+    """
+    return {
+        "id": f"00000000-0000-0000-0000-{index:012d}",
+        "organizationId": "00000000-0000-0000-0000-000000000000",
+        "projectId": project_id,
+        "key": key,
+        "value": value,
+        "note": "",
+        "creationDate": "1970-01-01T00:00:00.000000000Z",
+        "revisionDate": revision_date(day),
+    }
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardencircuitbreaker import BitwardenCircuitBreaker
+from bitwardensyncerror import BitwardenSyncError
+
+unauthorized = BitwardenSyncError("bws error: b'Error: Received error message from server: [401 Unauthorized]'")
+rate_limited = BitwardenSyncError("bws error: b'Error: [429 Too Many Requests]'")
+other_error = BitwardenSyncError("bws error: b'Error: connection refused'")
+
+class TestBitwardenCircuitBreaker(unittest.TestCase):
+
+    def test_00(self):
+        self.assertTrue(BitwardenCircuitBreaker.is_token_failure(unauthorized))
+        self.assertTrue(BitwardenCircuitBreaker.is_token_failure(rate_limited))
+        self.assertFalse(BitwardenCircuitBreaker.is_token_failure(other_error))
+
+    def test_01(self):
+        breaker = BitwardenCircuitBreaker()
+        for _ in range(BitwardenCircuitBreaker.threshold - 1):
+            breaker.record_failure(unauthorized)
+        breaker.record_failure(other_error)
+        breaker.record_failure(rate_limited)
+        self.assertEqual(breaker.state, 'closed')
+        for _ in range(BitwardenCircuitBreaker.threshold - 1):
+            breaker.record_failure(rate_limited)
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker.allow_request())
+
+    def test_02(self):
+        breaker = BitwardenCircuitBreaker()
+        for _ in range(BitwardenCircuitBreaker.threshold):
+            breaker.record_failure(unauthorized)
+        # Expire open period to allow a single probe
+        breaker.open_until = 0
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_failure(unauthorized)
+        self.assertEqual(breaker.state, 'open')
+        breaker.open_until = 0
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, 'closed')
+        self.assertTrue(breaker.allow_request())
+
+    def test_03(self):
+        breaker = BitwardenCircuitBreaker()
+        for _ in range(BitwardenCircuitBreaker.threshold):
+            breaker.record_failure(unauthorized)
+        breaker.open_until = 0
+        self.assertTrue(breaker.allow_request())
+        # Probe cancelled before recording a result
+        breaker.release_probe()
+        self.assertTrue(breaker.allow_request())
+
+    def test_04(self):
+        self.assertIs(
+            BitwardenCircuitBreaker.get("token"),
+            BitwardenCircuitBreaker.get("token"),
+        )
+        self.assertIsNot(
+            BitwardenCircuitBreaker.get("token"),
+            BitwardenCircuitBreaker.get("other-token"),
+        )
+
+if __name__ == '__main__':
+    unittest.main()
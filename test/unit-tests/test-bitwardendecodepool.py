@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+import asyncio
+import time
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardendecodepool import BitwardenDecodePool
+from bitwardenfixtures import secret_definition
+from bitwardensecrets import BitwardenSecrets
+
+class TestBitwardenDecodePool(unittest.TestCase):
+
+    def setUp(self):
+        BitwardenDecodePool.samples.clear()
+        BitwardenDecodePool.min_secrets = 10
+
+    def decode(self, mode, count):
+        async def run():
+            BitwardenDecodePool.mode = mode
+            await BitwardenDecodePool.on_startup()
+            try:
+                return await BitwardenSecrets.decode([
+                    secret_definition(f"secret_{i}", f"a: {{b: {i}}}", index=i)
+                    for i in range(count)
+                ])
+            finally:
+                await BitwardenDecodePool.on_cleanup()
+        return asyncio.run(run())
+
+    def test_00(self):
+        bitwarden_secrets = self.decode('thread', 20)
+        self.assertEqual(bitwarden_secrets.secrets_by_key['secret_19'][0].value, {"a": {"b": 19}})
+        stats = BitwardenDecodePool.stats()
+        self.assertEqual(stats['offloaded']['count'], 1)
+        self.assertEqual(stats['inline']['count'], 0)
+
+    def test_01(self):
+        bitwarden_secrets = self.decode('thread', 5)
+        self.assertEqual(len(bitwarden_secrets.secrets), 5)
+        stats = BitwardenDecodePool.stats()
+        self.assertEqual(stats['inline']['count'], 1)
+        self.assertEqual(stats['recent'][0]['duration'], stats['recent'][0]['loopBlocked'])
+
+    def test_02(self):
+        bitwarden_secrets = self.decode('process', 20)
+        self.assertEqual(bitwarden_secrets.secrets_by_id["00000000-0000-0000-0000-000000000003"].key, "secret_3")
+        self.assertEqual(BitwardenDecodePool.stats()['offloaded']['count'], 1)
+
+    def test_03(self):
+        # Loop lag while waiting includes time the loop is blocked, not only submission
+        async def run():
+            future = asyncio.get_running_loop().create_future()
+            def block():
+                time.sleep(0.05)
+                future.set_result(None)
+            asyncio.get_running_loop().call_later(0.001, block)
+            return await BitwardenDecodePool.measure_lag(future)
+        self.assertGreaterEqual(asyncio.run(run()), 0.03)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardenkeymap import BitwardenKeyMap
+from bitwardenprojects import BitwardenProjects
+
+bitwarden_projects = BitwardenProjects([{
+    "id": "00000000-0000-0000-0000-000000000000",
+    "name": "project0",
+}, {
+    "id": "00000000-0000-0000-0000-000000000001",
+    "name": "project1",
+}])
+
+definitions = [{
+    "id": f"10000000-0000-0000-0000-{i:012d}",
+    "projectId": "00000000-0000-0000-0000-000000000000",
+    "key": f"secret{i}",
+} for i in range(100)] + [{
+    "id": "20000000-0000-0000-0000-000000000000",
+    "projectId": "00000000-0000-0000-0000-000000000001",
+    "key": "secret0",
+}]
+
+class TestBitwardenKeyMap(unittest.TestCase):
+
+    def test_00(self):
+        key_map = BitwardenKeyMap(definitions, list_duration=1.0)
+        self.assertEqual(
+            key_map.get_secret_ids([("project1", "secret0"), (None, "secret1")], bitwarden_projects),
+            ["10000000-0000-0000-0000-000000000001", "20000000-0000-0000-0000-000000000000"],
+        )
+        self.assertEqual(
+            key_map.get_secret_ids([(None, "secret0")], bitwarden_projects),
+            ["10000000-0000-0000-0000-000000000000", "20000000-0000-0000-0000-000000000000"],
+        )
+
+    def test_01(self):
+        key_map = BitwardenKeyMap(definitions, list_duration=1.0)
+        self.assertIsNone(key_map.get_secret_ids([(None, "unknown")], bitwarden_projects))
+        self.assertIsNone(key_map.get_secret_ids([("project2", "secret0")], bitwarden_projects))
+
+    def test_02(self):
+        key_map = BitwardenKeyMap(definitions, list_duration=1.0)
+        # Without timings, decide on org size
+        self.assertTrue(key_map.prefer_selective(3))
+        self.assertFalse(key_map.prefer_selective(11))
+        # With timings, decide on expected duration
+        key_map.observe_get(0.5)
+        self.assertTrue(key_map.prefer_selective(key_map.concurrency))
+        self.assertFalse(key_map.prefer_selective(key_map.concurrency * 2 + 1))
+
+    def test_03(self):
+        key_map = BitwardenKeyMap(definitions, list_duration=1.0)
+        self.assertTrue(key_map.matches(definitions[:3]))
+        self.assertFalse(key_map.matches([dict(definitions[0], key="renamed")]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardenfixtures import secret_definition
+from bitwardenrendercache import BitwardenRenderCache
+from bitwardensyncconfigsecretsource import BitwardenSyncConfigSecretSource
+from bitwardenprojects import BitwardenProjects
+from bitwardensecrets import BitwardenSecrets
+from bitwardensyncerror import BitwardenSyncError
+
+bitwarden_projects = BitwardenProjects([])
+
+class TestBitwardenRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        BitwardenSecrets.render_cache.clear()
+
+    def test_00(self):
+        cache = BitwardenRenderCache(maxsize=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")
+        cache.put("c", "3")
+        self.assertEqual(cache.size, 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(cache.hit_rate, 2 / 3)
+
+    def test_01(self):
+        sources = {
+            "nested": BitwardenSyncConfigSecretSource({
+                "secret": "cached_secret",
+                "key": "a.b",
+            }),
+        }
+        secrets = BitwardenSecrets([secret_definition("cached_secret", "a: {b: one}")])
+        for _ in range(3):
+            self.assertEqual(
+                secrets.get_values(sources, bitwarden_projects),
+                {"nested": "one"},
+            )
+        self.assertEqual(BitwardenSecrets.render_cache.misses, 1)
+        self.assertEqual(BitwardenSecrets.render_cache.hits, 2)
+
+    def test_02(self):
+        sources = {
+            "nested": BitwardenSyncConfigSecretSource({
+                "secret": "cached_secret",
+                "key": "a.b",
+            }),
+        }
+        secrets = BitwardenSecrets([secret_definition("cached_secret", "a: {b: one}")])
+        self.assertEqual(secrets.get_values(sources, bitwarden_projects), {"nested": "one"})
+        secrets = BitwardenSecrets([secret_definition("cached_secret", "a: {b: two}", day=2)])
+        self.assertEqual(secrets.get_values(sources, bitwarden_projects), {"nested": "two"})
+        self.assertEqual(
+            secrets.get_values(sources, bitwarden_projects, for_data=True),
+            {"nested": "dHdv"},
+        )
+        self.assertEqual(BitwardenSecrets.render_cache.size, 3)
+
+    def test_03(self):
+        sources = {
+            "url": BitwardenSyncConfigSecretSource({
+                "template": "postgres://${user}:${password}@db/${name}",
+                "vars": {
+                    "name": {"value": "app"},
+                    "password": {"secret": "cached_secret", "key": "password"},
+                    "user": {"secret": "cached_secret", "key": "user"},
+                },
+            }),
+        }
+        secrets = BitwardenSecrets([secret_definition("cached_secret", "{user: one, password: two}")])
+        for _ in range(3):
+            self.assertEqual(
+                secrets.get_values(sources, bitwarden_projects),
+                {"url": "postgres://one:two@db/app"},
+            )
+        # Template and both vars rendered once
+        self.assertEqual(BitwardenSecrets.render_cache.misses, 3)
+        self.assertEqual(BitwardenSecrets.render_cache.hits, 2)
+        secrets = BitwardenSecrets([secret_definition("cached_secret", "{user: one, password: three}", day=2)])
+        self.assertEqual(
+            secrets.get_values(sources, bitwarden_projects),
+            {"url": "postgres://one:three@db/app"},
+        )
+
+    def test_04(self):
+        sources = {
+            "url": BitwardenSyncConfigSecretSource({
+                "template": "${user}:${password}",
+                "vars": {"user": {"secret": "cached_secret"}},
+            }),
+        }
+        secrets = BitwardenSecrets([secret_definition("cached_secret", "one")])
+        with self.assertRaisesRegex(BitwardenSyncError, "password"):
+            secrets.get_values(sources, bitwarden_projects)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -141,5 +141,30 @@ class TestBitwardenSecrets(unittest.TestCase):
         with self.assertRaises(BitwardenSyncError):
             bitwarden_secrets.get_values(sources, bitwarden_projects)
 
+    def test_09(self):
+        sources = {
+            "value": BitwardenSyncConfigSecretSource({
+                "value": "value pass-through",
+            }),
+            "secret-with-key": BitwardenSyncConfigSecretSource({
+                "key": "nested.key01",
+                "secret": "dict_secret",
+            }),
+        }
+        self.assertEqual(
+            bitwarden_secrets.get_values(sources, bitwarden_projects, for_data=True),
+            {
+                "value": "dmFsdWUgcGFzcy10aHJvdWdo",
+                "secret-with-key": "bmVzdGVkIHZhbHVl",
+            },
+        )
+
+    def test_10(self):
+        self.assertTrue(bitwarden_secrets.covers({('project0', 'simple_secret')}))
+        selected = BitwardenSecrets([])
+        selected.refs = frozenset({('project0', 'simple_secret'), (None, 'dict_secret')})
+        self.assertTrue(selected.covers({('project0', 'simple_secret')}))
+        self.assertFalse(selected.covers({('project0', 'simple_secret'), (None, 'other_secret')}))
+
 if __name__ == '__main__':
     unittest.main()
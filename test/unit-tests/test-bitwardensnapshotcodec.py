@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardenfixtures import revision_date, secret_definition
+from bitwardensnapshotcodec import BitwardenSnapshotCodec
+
+listing = BitwardenSnapshotCodec.make_listing([
+    secret_definition("secret_1", "one", index=1, day=1),
+    secret_definition("secret_2", "two", index=2, day=2),
+], fetched_at=1000)
+
+class TestBitwardenSnapshotCodec(unittest.TestCase):
+
+    def test_00(self):
+        snapshot = {"projects": {"definitions": [], "fetchedAt": 1000}, "secrets": {"": listing}}
+        encoded = BitwardenSnapshotCodec.encode(snapshot)
+        self.assertEqual(BitwardenSnapshotCodec.decode(encoded), snapshot)
+        self.assertEqual(listing['revisionDate'], revision_date(2))
+
+    def test_01(self):
+        snapshot = {
+            "projects": {"definitions": [], "fetchedAt": 1000},
+            "secrets": {"": listing, "project": {**listing, "fetchedAt": 500}},
+        }
+        self.assertEqual(
+            BitwardenSnapshotCodec.expire(snapshot, max_age=300, now=1200),
+            {"projects": snapshot['projects'], "secrets": {"": listing}},
+        )
+        self.assertIsNone(BitwardenSnapshotCodec.expire(snapshot, max_age=300, now=1400))
+        self.assertIsNone(BitwardenSnapshotCodec.expire({"projects": None}, max_age=300, now=1000))
+
+    def test_02(self):
+        merged = BitwardenSnapshotCodec.merge(listing, [
+            secret_definition("secret_1", "rotated", index=1, day=3),
+            secret_definition("secret_2", "stale", index=2, day=1),
+            secret_definition("secret_3", "new", index=3, day=3),
+        ])
+        self.assertEqual([definition['value'] for definition in merged['definitions']], ["rotated", "two"])
+        self.assertEqual(merged['revisionDate'], revision_date(3))
+        self.assertEqual(merged['fetchedAt'], 1000)
+        # Listing is replaced rather than modified
+        self.assertEqual(listing['definitions'][0]['value'], "one")
+
+    def test_03(self):
+        self.assertIsNone(BitwardenSnapshotCodec.merge(listing, [
+            secret_definition("secret_2", "two", index=2, day=2),
+        ]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+from types import SimpleNamespace
+sys.path.append('../../operator')
+
+from bitwardenfixtures import project_definitions, secret_definition
+from bitwardenprojects import BitwardenProjects
+from bitwardensecrets import BitwardenSecrets
+from bitwardensyncconfigsecret import BitwardenSyncConfigSecret
+from bitwardensyncindex import BitwardenSyncIndex, BitwardenSyncTarget
+
+bitwarden_projects = BitwardenProjects(project_definitions)
+
+config = SimpleNamespace(kind="BitwardenSyncConfig", namespace="operator", name="default")
+sync_secret = SimpleNamespace(kind="BitwardenSyncSecret", namespace="app", name="app-db")
+
+class TestBitwardenSyncIndex(unittest.TestCase):
+
+    def setUp(self):
+        BitwardenSyncIndex.clear()
+        BitwardenSyncIndex.update(
+            owner=config,
+            secret_configs=[
+                ("app", BitwardenSyncConfigSecret({
+                    "name": "app-secret-key",
+                    "data": {"token": {"secret": "app_secret_key"}},
+                    "labels": {"server": {"secret": "app_database_auth", "key": "server"}},
+                })),
+                ("app", BitwardenSyncConfigSecret({
+                    "name": "app-literal",
+                    "data": {"token": {"value": "literal"}},
+                })),
+            ],
+        )
+        BitwardenSyncIndex.update(
+            owner=sync_secret,
+            secret_configs=[
+                ("app", BitwardenSyncConfigSecret({
+                    "name": "app-db",
+                    "data": {"password": {"project": "project0", "secret": "app_database_auth"}},
+                })),
+            ],
+        )
+
+    def test_00(self):
+        self.assertEqual(
+            BitwardenSyncIndex.query(key="app_database_auth"),
+            [
+                {
+                    "kind": "BitwardenSyncConfig", "namespace": "operator", "name": "default",
+                    "secret_namespace": "app", "secret_name": "app-secret-key",
+                },
+                {
+                    "kind": "BitwardenSyncSecret", "namespace": "app", "name": "app-db",
+                    "secret_namespace": "app", "secret_name": "app-db",
+                },
+            ],
+        )
+
+    def test_01(self):
+        self.assertEqual(
+            BitwardenSyncIndex.get_targets([("project1", "app_database_auth")]),
+            {BitwardenSyncTarget("BitwardenSyncConfig", "operator", "default", "app", "app-secret-key")},
+        )
+
+    def test_02(self):
+        BitwardenSyncIndex.remove(sync_secret)
+        self.assertEqual(
+            BitwardenSyncIndex.get_targets([("project0", "app_database_auth")]),
+            {BitwardenSyncTarget("BitwardenSyncConfig", "operator", "default", "app", "app-secret-key")},
+        )
+
+    def test_03(self):
+        old_secrets = BitwardenSecrets([
+            secret_definition("app_secret_key", index=1),
+            secret_definition("app_database_auth", index=2),
+        ])
+        new_secrets = BitwardenSecrets([
+            secret_definition("app_secret_key", index=1),
+            secret_definition("app_database_auth", index=2, day=2),
+            secret_definition("unused", index=3),
+        ])
+        changed_refs = new_secrets.changed_refs(old_secrets, bitwarden_projects)
+        self.assertEqual(changed_refs, {("project0", "app_database_auth"), ("project0", "unused")})
+        self.assertEqual(len(BitwardenSyncIndex.get_targets(changed_refs)), 2)
+
+    def test_04(self):
+        BitwardenSyncIndex.update(
+            owner=sync_secret,
+            secret_configs=[
+                ("app", BitwardenSyncConfigSecret({
+                    "name": "app-db",
+                    "data": {
+                        "url": {
+                            "project": "project0",
+                            "template": "${user}@${server}",
+                            "vars": {
+                                "server": {"secret": "app_database_auth", "key": "server"},
+                                "user": {"project": "project1", "secret": "app_user"},
+                            },
+                        },
+                    },
+                })),
+            ],
+        )
+        target = BitwardenSyncTarget("BitwardenSyncSecret", "app", "app-db", "app", "app-db")
+        self.assertIn(target, BitwardenSyncIndex.get_targets([("project0", "app_database_auth")]))
+        self.assertEqual(BitwardenSyncIndex.get_targets([("project1", "app_user")]), {target})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardensyncinterval import BitwardenSyncInterval
+
+spec = {
+    "adaptiveSyncInterval": {"minimum": 60, "maximum": 600},
+    "syncInterval": 300,
+}
+bitwarden_refs = {("project-a", "db-password"), (None, "api-key")}
+
+class TestBitwardenSyncInterval(unittest.TestCase):
+
+    def test_00(self):
+        # Without adaptiveSyncInterval syncInterval is used unchanged
+        self.assertIsNone(BitwardenSyncInterval.bounds({"syncInterval": 30}))
+        self.assertEqual(BitwardenSyncInterval.interval({"syncInterval": 30}, 1000), 30)
+        self.assertEqual(BitwardenSyncInterval.interval({}, None), 300)
+        self.assertIsNone(BitwardenSyncInterval.adapt(
+            {"syncInterval": 30}, 1000, bitwarden_refs, {(None, "api-key")},
+        ))
+
+    def test_01(self):
+        # Maximum is at least minimum, adaptive interval clamped to bounds
+        self.assertEqual(BitwardenSyncInterval.bounds({"adaptiveSyncInterval": {}}), (60, 3600))
+        self.assertEqual(
+            BitwardenSyncInterval.bounds({"adaptiveSyncInterval": {"minimum": 900, "maximum": 600}}),
+            (900, 900),
+        )
+        self.assertEqual(BitwardenSyncInterval.interval(spec, None), 300)
+        self.assertEqual(BitwardenSyncInterval.interval(spec, 10), 60)
+        self.assertEqual(BitwardenSyncInterval.interval(spec, 5000), 600)
+        self.assertEqual(BitwardenSyncInterval.interval({**spec, "syncInterval": 900}, None), 600)
+
+    def test_02(self):
+        # Changed project and key, key in any project, and unreferenced change
+        self.assertTrue(BitwardenSyncInterval.is_changed(bitwarden_refs, {("project-a", "db-password")}))
+        self.assertTrue(BitwardenSyncInterval.is_changed(bitwarden_refs, {("project-b", "api-key")}))
+        self.assertTrue(BitwardenSyncInterval.is_changed(bitwarden_refs, {(None, "db-password")}))
+        self.assertFalse(BitwardenSyncInterval.is_changed(bitwarden_refs, {("project-b", "db-password")}))
+        self.assertFalse(BitwardenSyncInterval.is_changed(bitwarden_refs, {("project-a", "other")}))
+        self.assertFalse(BitwardenSyncInterval.is_changed(bitwarden_refs, set()))
+
+    def test_03(self):
+        # Decrease after changes and increase without, within bounds
+        interval = BitwardenSyncInterval.adapt(spec, None, bitwarden_refs, {("project-a", "db-password")})
+        self.assertEqual(interval, 300 * BitwardenSyncInterval.decrease)
+        for _ in range(10):
+            interval = BitwardenSyncInterval.adapt(spec, interval, bitwarden_refs, {("project-a", "db-password")})
+        self.assertEqual(BitwardenSyncInterval.interval(spec, interval), 60)
+        for _ in range(10):
+            interval = BitwardenSyncInterval.adapt(spec, interval, bitwarden_refs, set())
+        self.assertEqual(BitwardenSyncInterval.interval(spec, interval), 600)
+        self.assertLessEqual(interval, 600 * BitwardenSyncInterval.increase)
+
+    def test_04(self):
+        # Unknown changes keep adaptive interval
+        self.assertEqual(BitwardenSyncInterval.adapt(spec, 120, bitwarden_refs, None), 120)
+        self.assertIsNone(BitwardenSyncInterval.adapt(spec, None, bitwarden_refs, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from bitwardensyncstatus import BitwardenSyncStatus
+
+status_entries = {
+    ("app", "app-secret"): {"name": "app-secret", "namespace": "app", "state": "synced", "uid": "1"},
+    ("app", "pull-secret"): {"name": "pull-secret", "namespace": "app", "state": "synced", "uid": "2"},
+    ("other", "app-secret"): {"name": "app-secret", "namespace": "other", "state": "synced", "uid": "3"},
+}
+
+class TestBitwardenSyncStatus(unittest.TestCase):
+
+    def test_00(self):
+        # Pending until namespace is created, then synced
+        pending_entries = {("new", "app-secret"): BitwardenSyncStatus.pending_entry("new", "app-secret")}
+        self.assertTrue(BitwardenSyncStatus.is_pending(pending_entries, "new", "app-secret"))
+        self.assertTrue(BitwardenSyncStatus.is_pending(None, "new", "app-secret"))
+        self.assertFalse(BitwardenSyncStatus.is_pending(status_entries, "app", "app-secret"))
+
+    def test_01(self):
+        # Deleted namespace then created again
+        updated = BitwardenSyncStatus.on_namespace_deleted(
+            status_entries, namespace="app", fan_out_names={"pull-secret"},
+        )
+        self.assertEqual(updated, {
+            ("app", "app-secret"): {
+                "error": "Namespace app does not exist",
+                "name": "app-secret",
+                "namespace": "app",
+                "state": "pending",
+            },
+            ("other", "app-secret"): status_entries[("other", "app-secret")],
+        })
+        self.assertTrue(BitwardenSyncStatus.is_pending(updated, "app", "app-secret"))
+        self.assertTrue(BitwardenSyncStatus.is_pending(updated, "app", "pull-secret"))
+        self.assertFalse(BitwardenSyncStatus.is_pending(updated, "other", "app-secret"))
+
+    def test_02(self):
+        self.assertIsNone(BitwardenSyncStatus.on_namespace_deleted(
+            status_entries, namespace="unused", fan_out_names=set(),
+        ))
+        self.assertIsNone(BitwardenSyncStatus.on_namespace_deleted(None, namespace="app", fan_out_names=set()))
+
+    def test_03(self):
+        # Full status lists every entry
+        entries = list(status_entries.values())
+        self.assertEqual(BitwardenSyncStatus.build_patch(entries), {
+            "failedSecrets": None,
+            "failedSecretsTruncated": None,
+            "secrets": entries,
+            "secretsDigest": None,
+            "summary": None,
+        })
+
+    def test_04(self):
+        # Compact status summarizes states and lists only failed entries
+        failed_entry = {"error": "Secret key not found", "name": "db", "namespace": "app", "state": "error"}
+        pending_entry = BitwardenSyncStatus.pending_entry("new", "app-secret")
+        entries = [*status_entries.values(), failed_entry, pending_entry]
+        patch = BitwardenSyncStatus.build_patch(entries, compact=True)
+        self.assertIsNone(patch['secrets'])
+        self.assertEqual(patch['summary'], {"error": 1, "pending": 1, "synced": 3, "total": 5})
+        self.assertEqual(patch['failedSecrets'], [failed_entry])
+        self.assertIsNone(patch['failedSecretsTruncated'])
+        self.assertEqual(patch['secretsDigest'], BitwardenSyncStatus.secrets_digest({
+            ("app", "app-secret"), ("app", "db"), ("app", "pull-secret"),
+            ("new", "app-secret"), ("other", "app-secret"),
+        }))
+        self.assertEqual(BitwardenSyncStatus.build_patch([], compact=True)['summary'], {"total": 0})
+
+    def test_05(self):
+        # Failed entries are limited regardless of config size
+        entries = [
+            {"error": "Forbidden", "name": "app-secret", "namespace": f"tenant-{i}", "state": "error"}
+            for i in range(1000)
+        ] + [BitwardenSyncStatus.pending_entry(f"new-{i}", "app-secret") for i in range(1000)]
+        patch = BitwardenSyncStatus.build_patch(entries, compact=True)
+        self.assertEqual(patch['failedSecrets'], entries[:BitwardenSyncStatus.failed_secrets_limit])
+        self.assertEqual(patch['failedSecretsTruncated'], 1000 - BitwardenSyncStatus.failed_secrets_limit)
+        self.assertEqual(patch['summary'], {"error": 1000, "pending": 1000, "total": 2000})
+
+    def test_06(self):
+        # Digest depends on set of targets, not their order
+        digest = BitwardenSyncStatus.secrets_digest([("app", "a"), ("app", "b")])
+        self.assertEqual(digest, BitwardenSyncStatus.secrets_digest([("app", "b"), ("app", "a")]))
+        self.assertNotEqual(digest, BitwardenSyncStatus.secrets_digest([("app", "a")]))
+        self.assertNotEqual(digest, BitwardenSyncStatus.secrets_digest([("app", "a"), ("other", "b")]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+import json
+import unittest
+import sys
+from time import time
+sys.path.append('../../operator')
+
+from bitwardenwebhook import BitwardenChangeEvent, BitwardenWebhook
+from bitwardenwebhookerror import BitwardenWebhookError
+
+BitwardenWebhook.secret = 'test-secret'
+
+class TestBitwardenWebhook(unittest.TestCase):
+
+    def test_00(self):
+        body = b'{"secretId": "a"}'
+        timestamp = str(int(time()))
+        BitwardenWebhook.verify(body, BitwardenWebhook.sign(body, timestamp), timestamp)
+
+    def test_01(self):
+        body = b'{"secretId": "a"}'
+        timestamp = str(int(time()))
+        signature = BitwardenWebhook.sign(body, timestamp, secret='other-secret')
+        with self.assertRaisesRegex(BitwardenWebhookError, "invalid signature"):
+            BitwardenWebhook.verify(body, signature, timestamp)
+        with self.assertRaisesRegex(BitwardenWebhookError, "invalid signature"):
+            BitwardenWebhook.verify(b'{"secretId": "b"}', BitwardenWebhook.sign(body, timestamp), timestamp)
+        with self.assertRaisesRegex(BitwardenWebhookError, "missing signature"):
+            BitwardenWebhook.verify(body, None, timestamp)
+
+    def test_02(self):
+        body = b'{"secretId": "a"}'
+        timestamp = str(int(time()) - BitwardenWebhook.tolerance - 1)
+        with self.assertRaisesRegex(BitwardenWebhookError, "tolerance"):
+            BitwardenWebhook.verify(body, BitwardenWebhook.sign(body, timestamp), timestamp)
+
+    def test_03(self):
+        events = BitwardenWebhook.parse_events(json.dumps({
+            "events": [
+                {"secretId": "a"},
+                {"key": "b", "project": "p"},
+            ],
+        }).encode('utf-8'))
+        self.assertEqual(events, [
+            BitwardenChangeEvent(secret_id='a', key=None, project_id=None, project=None),
+            BitwardenChangeEvent(secret_id=None, key='b', project_id=None, project='p'),
+        ])
+        self.assertEqual(
+            BitwardenWebhook.parse_events(b'{"key": "c"}'),
+            [BitwardenChangeEvent(secret_id=None, key='c', project_id=None, project=None)],
+        )
+
+    def test_04(self):
+        for body in (b'not json', b'[]', b'{"events": {}}', b'{"events": [{}]}'):
+            with self.assertRaises(BitwardenWebhookError):
+                BitwardenWebhook.parse_events(body)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from diffbasecodec import DiffBaseCodec
+
+essence = {
+    "metadata": {"labels": {"app": "test"}},
+    "spec": {
+        "secrets": [
+            {"name": f"secret-{i}", "data": {"password": {"secret": f"key-{i}"}}}
+            for i in range(100)
+        ],
+    },
+}
+
+class TestDiffBaseCodec(unittest.TestCase):
+
+    def tearDown(self):
+        DiffBaseCodec.mode = 'full'
+        DiffBaseCodec.max_bytes = 16384
+
+    def test_00(self):
+        encoded = DiffBaseCodec.encode(essence)
+        self.assertEqual(encoded, DiffBaseCodec.dumps(essence) + '\n')
+        self.assertEqual(DiffBaseCodec.decode(encoded), essence)
+
+    def test_01(self):
+        DiffBaseCodec.mode = 'compressed'
+        encoded = DiffBaseCodec.encode(essence)
+        self.assertTrue(encoded.startswith(DiffBaseCodec.compressed_prefix))
+        self.assertLess(len(encoded), len(DiffBaseCodec.dumps(essence)))
+        self.assertEqual(DiffBaseCodec.decode(encoded), essence)
+
+    def test_02(self):
+        DiffBaseCodec.mode = 'compressed'
+        DiffBaseCodec.max_bytes = 10
+        encoded = DiffBaseCodec.encode(essence)
+        self.assertTrue(encoded.startswith(DiffBaseCodec.hash_prefix))
+
+    def test_03(self):
+        DiffBaseCodec.mode = 'hash'
+        encoded = DiffBaseCodec.encode(essence)
+        self.assertTrue(encoded.startswith(DiffBaseCodec.hash_prefix))
+        self.assertEqual(DiffBaseCodec.decode(encoded, essence), essence)
+        changed = {**essence, "spec": {"secrets": []}}
+        self.assertEqual(DiffBaseCodec.decode(encoded, changed), {})
+        self.assertIsNone(DiffBaseCodec.decode(None, essence))
+
+    def test_04(self):
+        DiffBaseCodec.mode = 'compressed'
+        DiffBaseCodec.objects.clear()
+        encoded = DiffBaseCodec.encode(essence)
+        DiffBaseCodec.record('uid-a', essence, encoded)
+        stats = DiffBaseCodec.stats()
+        self.assertEqual(stats['objects'], 1)
+        self.assertEqual(stats['objectBytes'], len(encoded))
+        self.assertGreater(stats['objectBytesSaved'], 0)
+        DiffBaseCodec.remove('uid-a')
+        self.assertEqual(DiffBaseCodec.stats()['objects'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+from types import SimpleNamespace
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from driftrepair import DriftRepair
+
+secret = SimpleNamespace(
+    metadata=SimpleNamespace(name="app-secret", namespace="app", resource_version="1"),
+)
+
+class TestDriftRepair(unittest.TestCase):
+
+    def setUp(self):
+        DriftRepair.operator_deletes.clear()
+        DriftRepair.operator_resource_versions.clear()
+
+    def test_00(self):
+        # Nothing recorded while disabled as watch events would never remove it
+        DriftRepair.enabled = False
+        DriftRepair.record_write(secret)
+        DriftRepair.record_delete(name="old-secret", namespace="app")
+        self.assertEqual(DriftRepair.operator_resource_versions, {})
+        self.assertEqual(DriftRepair.operator_deletes, set())
+
+    def test_01(self):
+        # Operator writes and deletes are recognized once, then forgotten
+        DriftRepair.enabled = True
+        DriftRepair.record_write(secret)
+        DriftRepair.record_delete(name="old-secret", namespace="app")
+        self.assertTrue(DriftRepair.is_operator_change('MODIFIED', "app-secret", "app", "1"))
+        self.assertFalse(DriftRepair.is_operator_change('MODIFIED', "app-secret", "app", "2"))
+        self.assertTrue(DriftRepair.is_operator_change('DELETED', "old-secret", "app", "3"))
+        self.assertFalse(DriftRepair.is_operator_change('DELETED', "old-secret", "app", "3"))
+        self.assertFalse(DriftRepair.is_operator_change('DELETED', "app-secret", "app", "4"))
+        self.assertEqual(DriftRepair.operator_resource_versions, {})
+        self.assertEqual(DriftRepair.operator_deletes, set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from k8spoolstats import K8sPoolStats
+
+class TestK8sPoolStats(unittest.TestCase):
+
+    def test_00(self):
+        pool_stats = K8sPoolStats(name='default', maxsize=2)
+        pool_stats.request_start()
+        pool_stats.request_start()
+        pool_stats.request_end()
+        pool_stats.request_start()
+        stats = pool_stats.stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['inFlight'], 2)
+        self.assertEqual(stats['maxInFlight'], 2)
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['queuedRatio'], 0)
+
+    def test_01(self):
+        pool_stats = K8sPoolStats(name='status', maxsize=1)
+        pool_stats.request_start()
+        wait = pool_stats.queue_end(pool_stats.queue_start() - 0.5)
+        self.assertGreaterEqual(wait, 0.5)
+        stats = pool_stats.stats()
+        self.assertEqual(stats['queued'], 1)
+        self.assertEqual(stats['queuedRatio'], 1)
+        self.assertGreaterEqual(stats['queueWaitMax'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
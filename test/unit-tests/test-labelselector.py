@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from labelselector import LabelSelector
+
+class TestLabelSelector(unittest.TestCase):
+
+    def test_00(self):
+        selector = LabelSelector.parse('tier=prod,team in (a, b),!legacy,owner')
+        self.assertTrue(selector.matches({"tier": "prod", "team": "b", "owner": "x"}))
+        self.assertFalse(selector.matches({"tier": "prod", "team": "c", "owner": "x"}))
+        self.assertFalse(selector.matches({"tier": "prod", "team": "a", "owner": "x", "legacy": ""}))
+        self.assertFalse(selector.matches({"tier": "prod", "team": "a"}))
+
+    def test_01(self):
+        selector = LabelSelector.parse('tier!=dev,team notin (c)')
+        self.assertTrue(selector.matches({}))
+        self.assertTrue(selector.matches({"tier": "prod", "team": "a"}))
+        self.assertFalse(selector.matches({"tier": "dev"}))
+        self.assertFalse(selector.matches({"team": "c"}))
+
+    def test_02(self):
+        selector = LabelSelector.parse('')
+        self.assertFalse(selector)
+        self.assertTrue(selector.matches(None))
+        with self.assertRaises(ValueError):
+            LabelSelector.parse('a=b=c')
+
+    def test_03(self):
+        selector = LabelSelector.from_dict({
+            "matchLabels": {"tier": "prod"},
+            "matchExpressions": [
+                {"key": "team", "operator": "In", "values": ["a", "b"]},
+                {"key": "legacy", "operator": "DoesNotExist"},
+            ],
+        })
+        self.assertTrue(selector.matches({"tier": "prod", "team": "a"}))
+        self.assertFalse(selector.matches({"tier": "prod", "team": "a", "legacy": "true"}))
+        self.assertFalse(selector.matches({"tier": "dev", "team": "a"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+import asyncio
+import logging
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from syncadmissionqueue import SyncAdmissionQueue
+
+logger = logging.getLogger('test')
+
+class TestSyncAdmissionQueue(unittest.TestCase):
+
+    def test_00(self):
+        order = []
+        running = []
+        max_running = []
+
+        def make_sync(name):
+            async def sync():
+                running.append(name)
+                max_running.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(name)
+                order.append(name)
+            return sync
+
+        async def run():
+            SyncAdmissionQueue.parallelism = 2
+            await SyncAdmissionQueue.on_startup()
+            # Queue everything before workers run
+            for name, priority in (("healthy", 2), ("new", 1), ("failed", 0), ("failed2", 0)):
+                SyncAdmissionQueue.submit(
+                    key=name, logger=logger, priority=priority, sync=make_sync(name),
+                )
+            SyncAdmissionQueue.submit(
+                key="failed", logger=logger, priority=0, sync=make_sync("duplicate"),
+            )
+            SyncAdmissionQueue.submit(
+                delay=0.05, key="delayed", logger=logger, priority=0, sync=make_sync("delayed"),
+            )
+            self.assertTrue(SyncAdmissionQueue.is_pending("delayed"))
+            await asyncio.sleep(0.1)
+            await SyncAdmissionQueue.queue.join()
+            await SyncAdmissionQueue.on_cleanup()
+
+        asyncio.run(run())
+        self.assertEqual(set(order[:2]), {"failed", "failed2"})
+        self.assertEqual(order[2:], ["new", "healthy", "delayed"])
+        self.assertEqual(max(max_running), 2)
+        self.assertFalse(SyncAdmissionQueue.is_pending("delayed"))
+
+    def test_01(self):
+        order = []
+
+        def make_sync(name):
+            async def sync():
+                order.append(name)
+            return sync
+
+        async def run():
+            await SyncAdmissionQueue.on_startup()
+            SyncAdmissionQueue.submit(
+                delay=10, key="resumed", logger=logger, priority=2, sync=make_sync("resumed"),
+            )
+            # Immediate sync replaces delayed resume sync
+            SyncAdmissionQueue.submit(key="resumed", logger=logger, priority=0, sync=make_sync("webhook"))
+            SyncAdmissionQueue.submit(
+                delay=10, key="deleted", logger=logger, priority=2, sync=make_sync("deleted"),
+            )
+            SyncAdmissionQueue.cancel("deleted")
+            await SyncAdmissionQueue.queue.join()
+            SyncAdmissionQueue.submit(
+                delay=10, key="shutdown", logger=logger, priority=2, sync=make_sync("shutdown"),
+            )
+            await SyncAdmissionQueue.on_cleanup()
+
+        asyncio.run(run())
+        self.assertEqual(order, ["webhook"])
+        self.assertEqual(SyncAdmissionQueue.delayed, {})
+        self.assertFalse(SyncAdmissionQueue.is_pending("deleted"))
+
+if __name__ == '__main__':
+    unittest.main()
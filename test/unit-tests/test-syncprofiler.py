@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+import unittest
+import sys
+sys.path.append('../../operator')
+
+from syncprofiler import SyncProfiler
+
+def work():
+    return sum(i * i for i in range(1000))
+
+class TestSyncProfiler(unittest.TestCase):
+
+    def setUp(self):
+        SyncProfiler.remaining = 0
+        SyncProfiler.results.clear()
+
+    def test_00(self):
+        with SyncProfiler.profile(name='unprofiled'):
+            work()
+        self.assertEqual(len(SyncProfiler.results), 0)
+
+    def test_01(self):
+        SyncProfiler.request(1)
+        with SyncProfiler.profile(name='first'):
+            work()
+        with SyncProfiler.profile(name='second'):
+            work()
+        status = SyncProfiler.status()
+        self.assertEqual(status['remaining'], 0)
+        self.assertEqual([result['name'] for result in status['results']], ['first'])
+        self.assertIn('work', status['results'][0]['stats'])
+
+    def test_02(self):
+        SyncProfiler.request(2)
+        with SyncProfiler.profile(name='outer'):
+            with SyncProfiler.profile(name='overlapping'):
+                work()
+        self.assertEqual(SyncProfiler.remaining, 1)
+        self.assertEqual([result['name'] for result in SyncProfiler.results], ['outer'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Stand-in for a Bitwarden change notification sender, for local testing of the
+operator webhook receiver.
+
+    WEBHOOK_SECRET=... ./test/webhook-sender.py --key app_database_auth
+    WEBHOOK_SECRET=... ./test/webhook-sender.py --secret-id <id> --url http://localhost:8090/webhook/bitwarden
+"""
+
+from time import time
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'operator'))
+
+# pylint: disable-next=wrong-import-position
+from bitwardenwebhook import BitwardenWebhook
+
+def main():
+    parser = argparse.ArgumentParser(description="Send signed Bitwarden change notification")
+    parser.add_argument('--url', default='http://localhost:8090/webhook/bitwarden')
+    parser.add_argument('--secret', default=os.environ.get('WEBHOOK_SECRET'))
+    parser.add_argument('--secret-id', action='append', default=[])
+    parser.add_argument('--key', action='append', default=[])
+    parser.add_argument('--project')
+    args = parser.parse_args()
+
+    if not args.secret:
+        parser.error("--secret or WEBHOOK_SECRET is required")
+    if not args.secret_id and not args.key:
+        parser.error("at least one --secret-id or --key is required")
+
+    events = [{"secretId": secret_id} for secret_id in args.secret_id]
+    for key in args.key:
+        event = {"key": key}
+        if args.project:
+            event['project'] = args.project
+        events.append(event)
+
+    body = json.dumps({"events": events}).encode('utf-8')
+    timestamp = str(int(time()))
+    request = urllib.request.Request(args.url, data=body, method='POST', headers={
+        "Content-Type": "application/json",
+        "X-Webhook-Signature": BitwardenWebhook.sign(body, timestamp, secret=args.secret),
+        "X-Webhook-Timestamp": timestamp,
+    })
+    try:
+        with urllib.request.urlopen(request) as response:
+            print(response.status, response.read().decode('utf-8'))
+    except urllib.error.HTTPError as err:
+        print(err.code, err.read().decode('utf-8'))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()